@@ -1,16 +1,25 @@
 from __future__ import annotations
 import logging
-from typing import Protocol, Mapping
+from typing import Protocol, Mapping, runtime_checkable
 from app.domain.helpdesk import HelpdeskRequest
-from app.domain.service_catalog import ServiceCatalog
+from app.domain.service_catalog import ServiceCatalog, SLA
 from app.application.llm_classifier import LLMClassificationResult, LLMClassificationError
 from app.application.classify_helpdesk_requests_progress import _batches_progress
-from collections.abc import Sequence
-from app.application.service_catalog_matcher import ServiceCatalogMatcher
+from collections.abc import Callable, Generator, Iterable, Iterator, Sequence
+from app.application.service_catalog_matcher import ServiceCatalogMatcher, CatalogMatch
+from app.application.fill_helpdesk_sla import fill_missing_sla_fields
+from concurrent.futures import Future, ThreadPoolExecutor
+from collections import deque
+from contextlib import closing
+from itertools import islice
+from typing import TypeVar
 
 
 logger = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
 class RequestClassifier(Protocol):
     def classify_batch(
         self,
@@ -19,6 +28,15 @@ class RequestClassifier(Protocol):
     ) -> Mapping[str, LLMClassificationResult]:
         ...
 
+@runtime_checkable
+class BulkRequestClassifier(RequestClassifier, Protocol):
+    def classify_bulk(
+        self,
+        batches: Sequence[Sequence[HelpdeskRequest]],
+        service_catalog: ServiceCatalog,
+    ) -> Sequence[Mapping[str, LLMClassificationResult] | None]:
+        ...
+
 
 def classify_requests(
         classifier: RequestClassifier,
@@ -26,19 +44,84 @@ def classify_requests(
         requests_: Sequence[HelpdeskRequest],
         batch_size: int,
         examples_to_log: int = 3,
+        concurrency: int = 1,
+        max_batch_tokens: int = 0,
+        batch_mode: bool = False,
 ) -> list[HelpdeskRequest]:
+    """Classify all requests and return them in input order (see ``iter_classified_requests``)."""
+
+    # requests are updated in place and each is yielded exactly once,
+    # so draining the stream is enough to restore the input order.
+    # deque(maxlen=0) consumes the iterator in C; list() below allocates the result once at its final size
+    deque(
+        iter_classified_requests(
+            classifier,
+            service_catalog,
+            requests_,
+            batch_size,
+            examples_to_log=examples_to_log,
+            concurrency=concurrency,
+            max_batch_tokens=max_batch_tokens,
+            batch_mode=batch_mode,
+        ),
+        maxlen=0,
+    )
+    return list(requests_)
+
+def iter_classified_requests(
+        classifier: RequestClassifier,
+        service_catalog: ServiceCatalog,
+        requests_: Sequence[HelpdeskRequest],
+        batch_size: int,
+        examples_to_log: int = 3,
+        concurrency: int = 1,
+        max_batch_tokens: int = 0,
+        batch_mode: bool = False,
+) -> Iterator[HelpdeskRequest]:
+    """Classify requests in batches and yield each batch as soon as it is applied.
+
+        Canonical catalog values are written back onto the requests; when a pair
+        resolves to the catalog, missing SLA fields are filled from the same
+        catalog entry right away (no second lookup pass needed).
+
+        Requests are grouped by their current (category, type) before batching,
+        so similar tickets share a batch and consecutive prompts share a longer
+        common prefix (provider-side prompt caching). The sort is stable.
+
+        With ``max_batch_tokens`` set, batches are also capped by an estimated
+        prompt-token budget, so ``batch_size`` can be raised without overflowing
+        the model context on long tickets.
+
+        Up to ``concurrency`` batches are in flight at once (LLM calls are
+        network-bound). Batches are yielded in dispatch order regardless of which
+        one finishes first, so consumers can process early batches while later
+        ones are still waiting on the LLM. Closing the stream early cancels the
+        batches that have not been sent yet.
+
+        With ``batch_mode``, all batches go to the provider in one asynchronous
+        batch job (``classify_bulk``; cheaper, but results arrive only once the
+        whole job is done) and ``concurrency`` is not used.
+        """
+
     if not requests_:
         logger.info("[part 3 and 4] No helpdesk requests provided; skipping LLM step")
-        return []
-
-    matcher = ServiceCatalogMatcher(service_catalog)
+        return
 
-    classified_requests: list[HelpdeskRequest] = []
+    # nothing can resolve against an empty catalog: skip building the matcher
+    matcher = ServiceCatalogMatcher(service_catalog) if service_catalog.categories else None
+    if matcher is None:
+        logger.warning("[part 3 and 4] Service Catalog is empty; LLM results cannot be applied")
     logged_examples = 0
 
-    for _, _, batch_start, _, batch in _batches_progress(requests_, batch_size):
+    ordered_requests = sorted(requests_, key=_prefix_sort_key)
+    logger.debug("Grouped %d requests by (category, type) before LLM batching", len(ordered_requests))
+
+    def classify_batch(
+            progress: tuple[int, int, int, int, Sequence[HelpdeskRequest]],
+    ) -> tuple[int, Sequence[HelpdeskRequest], Mapping[str, LLMClassificationResult] | None]:
+        _, _, batch_start, _, batch = progress
         try:
-            batch_results = classifier.classify_batch(batch, service_catalog)
+            return batch_start, batch, classifier.classify_batch(batch, service_catalog)
         except LLMClassificationError as exc:
             logger.error(
                 "LLM batch classification failed for requests %d..%d: %s",
@@ -46,73 +129,191 @@ def classify_requests(
                 batch_start + len(batch) - 1,
                 exc,
             )
+            return batch_start, batch, None
+
+    batches = _batches_progress(ordered_requests, batch_size, max_batch_tokens)
+    outcomes: Generator[
+        tuple[int, Sequence[HelpdeskRequest], Mapping[str, LLMClassificationResult] | None], None, None
+    ]
+    if batch_mode:
+        outcomes = _classify_bulk(classifier, service_catalog, batches)
+    elif concurrency > 1:
+        outcomes = _map_bounded(classify_batch, batches, concurrency)
+    else:
+        # sequential: stays on the caller thread
+        outcomes = (classify_batch(progress) for progress in batches)
+    # closing the stream early closes outcomes too, cancelling batches not yet started
+    with closing(outcomes):
+        for batch_start, batch, batch_results in outcomes:
             # if the batch call fails, still include the raw requests in Excel
-            classified_requests.extend(batch)
-            continue
+            if batch_results is not None:
+                logged_examples += _apply_batch_results(
+                    batch,
+                    batch_results,
+                    batch_start,
+                    matcher,
+                    examples_to_log - logged_examples,
+                )
+            yield from batch
+
+def _map_bounded(
+        fn: Callable[[_T], _R],
+        items: Iterable[_T],
+        window: int,
+) -> Generator[_R, None, None]:
+    """Yield ``fn(item)`` in input order with at most ``window`` calls in flight.
 
-        # compute end index once
-        batch_end_index = batch_start + len(batch) - 1
-        logger.info(
-            "[part 3 and 4] LLM batch classified %d requests (index %d..%d)",
-            len(batch),
-            batch_start,
-            batch_end_index,
+        Items are pulled only when a slot frees up, so per-item side effects
+        (e.g. progress logs) happen at real dispatch time. Closing the generator
+        cancels calls that have not started; running ones are awaited.
+        """
+
+    items = iter(items)
+    with ThreadPoolExecutor(max_workers=window) as executor:
+        pending: deque[Future[_R]] = deque(executor.submit(fn, item) for item in islice(items, window))
+        try:
+            while pending:
+                result = pending.popleft().result()
+                # refill the freed slot before handing the result to the consumer
+                for item in islice(items, 1):
+                    pending.append(executor.submit(fn, item))
+                yield result
+        finally:
+            for future in pending:
+                future.cancel()
+
+def _classify_bulk(
+        classifier: RequestClassifier,
+        service_catalog: ServiceCatalog,
+        batches: Iterator[tuple[int, int, int, int, Sequence[HelpdeskRequest]]],
+) -> Generator[tuple[int, Sequence[HelpdeskRequest], Mapping[str, LLMClassificationResult] | None], None, None]:
+    if not isinstance(classifier, BulkRequestClassifier):
+        raise TypeError("batch_mode requires a classifier with classify_bulk")
+
+    starts_and_batches = [(batch_start, batch) for _, _, batch_start, _, batch in batches]
+    try:
+        all_results: Sequence[Mapping[str, LLMClassificationResult] | None] = classifier.classify_bulk(
+            [batch for _, batch in starts_and_batches],
+            service_catalog,
         )
+    except LLMClassificationError as exc:
+        logger.error("LLM batch job failed for all %d batch(es): %s", len(starts_and_batches), exc)
+        all_results = [None] * len(starts_and_batches)
 
-        set_category_count = 0
-        set_type_count = 0
-        missing_result_count = 0
-        rejected_pair_count = 0
-
-        for req in batch:
-            id = req.id or ""
-            result = batch_results.get(id)
-
-            if result is None:
-                missing_result_count += 1
-                classified_requests.append(req)
-                continue
-
-            # resolve to canonical catalog strings using both current + LLM suggestion
-            candidate_category = req.request_category or result.request_category
-            candidate_type = req.request_type or result.request_type
-            resolved = matcher.resolve(candidate_category, candidate_type)
-
-            if resolved is None:
-                # do not write non-catalog values (avoid breaking SLA lookup later)
-                rejected_pair_count += 1
-            else:
-                # write back canonical catalog casing/spaces
-                if not req.request_category:
-                    req.request_category = resolved.request_category
-                    set_category_count += 1
-
-                if not req.request_type:
-                    req.request_type = resolved.request_type
-                    set_type_count += 1
-
-            if logged_examples < examples_to_log:
-                logger.info(
-                    # log both raw and resolved for check canonicalization
-                    "[part 3 and 4] LLM result for %s: raw_category=%r raw_type=%r resolved=%r",
-                    req.id,
-                    result.request_category,
-                    result.request_type,
-                    None if resolved is None else (resolved.request_category, resolved.request_type),
-                )
-                logged_examples += 1
-
-            classified_requests.append(req)
-
-        # log summary if SLA was set from service catalog
-        logger.info(
-            "[part 3] Applied LLM classification: categories_set=%d types_set=%d missing_results=%d rejected_pairs=%d (batch %d..%d)",
-            set_category_count,
-            set_type_count,
-            missing_result_count,
-            rejected_pair_count,
-            batch_start,
-            batch_end_index,
+    if len(all_results) != len(starts_and_batches):
+        # never drop batches: missing entries leave their requests unclassified
+        logger.error(
+            "classify_bulk returned %d result(s) for %d batch(es); treating the mismatch as failed batches",
+            len(all_results),
+            len(starts_and_batches),
         )
+        missing = max(len(starts_and_batches) - len(all_results), 0)
+        all_results = [*all_results[:len(starts_and_batches)], *([None] * missing)]
+
+    for (batch_start, batch), batch_results in zip(starts_and_batches, all_results, strict=True):
+        yield batch_start, batch, batch_results
+
+def _prefix_sort_key(req: HelpdeskRequest) -> tuple[str, str, int]:
+    return (
+        req.request_category or "",
+        req.request_type or "",
+        len(req.short_description or ""),
+    )
+
+def _apply_batch_results(
+        batch: Sequence[HelpdeskRequest],
+        batch_results: Mapping[str, LLMClassificationResult],
+        batch_start: int,
+        matcher: ServiceCatalogMatcher | None,
+        examples_to_log: int,
+) -> int:
+    """Write canonical LLM results + catalog SLA back onto the batch; returns examples logged."""
+
+    # compute end index once
+    batch_end_index = batch_start + len(batch) - 1
+    logger.info(
+        "[part 3 and 4] LLM batch classified %d requests (index %d..%d)",
+        len(batch),
+        batch_start,
+        batch_end_index,
+    )
+
+    # look up + resolve the whole batch first (bound methods, no per-item attribute lookups),
+    # then apply mutations in a tight pass below
+    results = list(map(batch_results.get, [req.id or "" for req in batch]))
+    triples: list[tuple[HelpdeskRequest, LLMClassificationResult | None, tuple[CatalogMatch, SLA] | None]]
+    if matcher is None:
+        # empty catalog: every returned pair is rejected, no resolve calls needed
+        triples = [(req, result, None) for req, result in zip(batch, results)]
+    else:
+        resolve_with_sla = matcher.resolve_with_sla
+        triples = [
+            (
+                req,
+                result,
+                None if result is None else resolve_with_sla(
+                    # resolve to canonical catalog strings using both current + LLM suggestion
+                    req.request_category or result.request_category,
+                    req.request_type or result.request_type,
+                ),
+            )
+            for req, result in zip(batch, results)
+        ]
+
+    set_category_count = 0
+    set_type_count = 0
+    set_sla_count = 0
+    missing_result_count = results.count(None)
+    rejected_pair_count = 0
+    logged_examples = 0
+
+    for req, result, resolved_with_sla in triples:
+        if result is None:
+            continue
+
+        resolved: CatalogMatch | None = None
+
+        if resolved_with_sla is None:
+            # do not write non-catalog values (avoid breaking SLA lookup later)
+            rejected_pair_count += 1
+        else:
+            resolved, sla = resolved_with_sla
+
+            # write back canonical catalog casing/spaces (read each field once, write only on change)
+            request_category = req.request_category
+            request_type = req.request_type
+            if not request_category:
+                req.request_category = resolved.request_category
+                set_category_count += 1
+
+            if not request_type:
+                req.request_type = resolved.request_type
+                set_type_count += 1
+
+            # SLA comes from the resolved catalog entry; fill only missing parts
+            if any(fill_missing_sla_fields(req, sla.unit, sla.value)):
+                set_sla_count += 1
+
+        if logged_examples < examples_to_log:
+            logger.info(
+                # log both raw and resolved for check canonicalization
+                "[part 3 and 4] LLM result for %s: raw_category=%r raw_type=%r resolved=%r",
+                req.id,
+                result.request_category,
+                result.request_type,
+                None if resolved is None else (resolved.request_category, resolved.request_type),
+            )
+            logged_examples += 1
 
-    return classified_requests
\ No newline at end of file
+    # log summary if SLA was set from service catalog
+    logger.info(
+        "[part 3] Applied LLM classification: categories_set=%d types_set=%d sla_set=%d missing_results=%d rejected_pairs=%d (batch %d..%d)",
+        set_category_count,
+        set_type_count,
+        set_sla_count,
+        missing_result_count,
+        rejected_pair_count,
+        batch_start,
+        batch_end_index,
+    )
+    return logged_examples
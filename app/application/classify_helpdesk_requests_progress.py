@@ -7,15 +7,65 @@ from collections.abc import Iterator, Sequence
 
 logger = logging.getLogger(__name__)
 
+# rough prompt-size estimate: ~4 characters per token, plus the per-request labels/separator
+_CHARS_PER_TOKEN = 4
+_REQUEST_OVERHEAD_CHARS = 120
+
+def _estimate_tokens(req: HelpdeskRequest) -> int:
+    chars = (
+        _REQUEST_OVERHEAD_CHARS
+        + len(req.id or "")
+        + len(req.short_description or "")
+        + len(req.long_description or "")
+        + len(req.request_category or "")
+        + len(req.request_type or "")
+    )
+    return chars // _CHARS_PER_TOKEN
+
+def _batch_bounds(
+        requests_: Sequence[HelpdeskRequest],
+        batch_size: int,
+        max_batch_tokens: int = 0,
+) -> list[tuple[int, int]]:
+    """Return ``(start, stop)`` slice bounds for each batch.
+
+        Batches hold at most ``batch_size`` requests. When ``max_batch_tokens`` is
+        positive, a batch is also closed before its estimated prompt tokens would
+        exceed the budget (a single oversized request still gets its own batch).
+        """
+
+    total_requests = len(requests_)
+    if max_batch_tokens <= 0:
+        return [
+            (start, min(start + batch_size, total_requests))
+            for start in range(0, total_requests, batch_size)
+        ]
+
+    bounds: list[tuple[int, int]] = []
+    start = 0
+    batch_tokens = 0
+    for index, req in enumerate(requests_):
+        tokens = _estimate_tokens(req)
+        if index > start and (index - start >= batch_size or batch_tokens + tokens > max_batch_tokens):
+            bounds.append((start, index))
+            start = index
+            batch_tokens = 0
+        batch_tokens += tokens
+    if start < total_requests:
+        bounds.append((start, total_requests))
+    return bounds
+
 # display progress for batches when classify_requests in terminal
 def _batches_progress(
         requests_: Sequence[HelpdeskRequest],
         batch_size: int,
-) -> Iterator[Tuple[int, int, int, int, list[HelpdeskRequest]]]:
+        max_batch_tokens: int = 0,
+) -> Iterator[Tuple[int, int, int, int, Sequence[HelpdeskRequest]]]:
     """Yield batches of requests together with progress metadata.
 
-        Splits the incoming list of requests into batches of size
-        ``batch_size`` and logs an info-level message for each batch before it is
+        Splits the incoming list of requests into batches of up to
+        ``batch_size`` requests (and, if set, up to ``max_batch_tokens`` estimated
+        prompt tokens) and logs an info-level message for each batch before it is
         processed by the LLM classifier.
 
         If there are no requests, logs that the LLM step is skipped and returns
@@ -27,13 +77,13 @@ def _batches_progress(
         logger.info("[part 3 and 4] No requests to classify; skipping LLM step")
         return
 
-    total_batches = (total_requests + batch_size - 1) // batch_size
+    bounds = _batch_bounds(requests_, batch_size, max_batch_tokens)
+    total_batches = len(bounds)
 
-    for batch_index, batch_start in enumerate(range(0, total_requests, batch_size)):
-        batch: list[HelpdeskRequest] = list(
-            requests_[batch_start: batch_start + batch_size]
-        )
-        batch_end = batch_start + len(batch) - 1
+    for batch_index, (batch_start, batch_stop) in enumerate(bounds):
+        # slice directly; wrapping in list() copied every batch a second time
+        batch = requests_[batch_start:batch_stop]
+        batch_end = batch_stop - 1
 
         logger.info(
             "[part 3 and 4] Sending batch %d/%d to LLM "
@@ -45,4 +95,4 @@ def _batches_progress(
             batch_end,
         )
 
-        yield batch_index, total_batches, batch_start, batch_end, batch
\ No newline at end of file
+        yield batch_index, total_batches, batch_start, batch_end, batch
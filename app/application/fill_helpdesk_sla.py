@@ -1,11 +1,29 @@
 from __future__ import annotations
 from app.domain.helpdesk import HelpdeskRequest
 from app.domain.service_catalog import ServiceCatalog
+from app.shared.normalization import PAIR_KEY_SEP
 import logging
 
 
 logger = logging.getLogger(__name__)
 
+def fill_missing_sla_fields(req: HelpdeskRequest, unit: str, value: int) -> tuple[bool, bool]:
+    """Fill only the missing SLA parts of ``req``; returns (unit_filled, value_filled).
+
+        ``sla_unit`` is missing when None or blank, ``sla_value`` when None or 0.
+        """
+
+    sla_unit = req.sla_unit
+    sla_value = req.sla_value
+    missing_unit = sla_unit is None or not sla_unit.strip()
+    missing_value = sla_value is None or sla_value == 0
+
+    if missing_unit:
+        req.sla_unit = unit
+    if missing_value:
+        req.sla_value = value
+    return missing_unit, missing_value
+
 def fill_helpdesk_sla(requests: list[HelpdeskRequest], catalog: ServiceCatalog) -> None:
     """Fill missing SLA fields in-place using the Service Catalog.
 
@@ -32,61 +50,68 @@ def fill_helpdesk_sla(requests: list[HelpdeskRequest], catalog: ServiceCatalog)
     skipped_already_has_sla_count = 0
     sample_logged = 0
     sample_limit = 5
+    # checked once: skips building a LogRecord per request when DEBUG is off
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
 
-    # Build (category, request_type) -> (unit, value) index from catalog
-    sla_index: dict[tuple[str, str], tuple[str, int]] = {}
-    for cat in catalog.categories:
-        for req_type in cat.requests:
-            sla_index[(cat.name, req_type.name)] = (req_type.sla.unit, req_type.sla.value)
+    # exact-name index prebuilt by the catalog at construction
+    sla_index = catalog.sla_index
 
+    # partition up front: only requests with both category and type can match the catalog
+    classified: list[HelpdeskRequest] = []
+    pair_keys: list[str] = []
+    unclassified_count = 0
     for req in requests:
-        if not req.request_category or not req.request_type:
+        # stripped once here; blank values count as unclassified, not as unknown pairs
+        request_category = (req.request_category or "").strip()
+        request_type = (req.request_type or "").strip()
+        if not (request_category and request_type):
+            unclassified_count += 1
             continue
 
-        key = (req.request_category, req.request_type)
-        if key not in sla_index:
-            # don't warn for each request. Count and summarize.
-            unknown_pair_count += 1
+        pair_key = request_category + PAIR_KEY_SEP + request_type
+        sla_unit = req.sla_unit
+        if req.sla_value and sla_unit and sla_unit.strip():
+            # nothing to fill, but an unknown pair is still reported as catalog drift
+            if pair_key in sla_index:
+                skipped_already_has_sla_count += 1
+            else:
+                unknown_pair_count += 1
             continue
 
-        missing_unit = req.sla_unit is None or not req.sla_unit.strip()
-        missing_value = req.sla_value is None or req.sla_value == 0
-
-        if not (missing_unit or missing_value):
-            # track already-set SLA to see how much requests were did
-            skipped_already_has_sla_count += 1
-            continue
+        classified.append(req)
+        pair_keys.append(pair_key)
 
-        unit, value = sla_index[key]
+    # join phase: resolve all lookup keys in one map() pass
+    entries = list(map(sla_index.get, pair_keys))
 
-        changed = False
+    # writeback phase: only rows with a resolved catalog entry are touched
+    for req, entry in zip(classified, entries):
+        if entry is None:
+            # don't warn for each request. Count and summarize.
+            unknown_pair_count += 1
+            continue
 
         # fill only missing parts; do not overwrite existing non-missing values
-        if missing_unit:
-            req.sla_unit = unit
-            filled_unit_count += 1
-            changed = True
-
-        if missing_value:
-            req.sla_value = value
-            filled_value_count += 1
-            changed = True
-
-        if changed:
-            filled_requests += 1
-
-            # log only first N examples at INFO
-            if sample_logged < sample_limit:
-                logger.info(
-                    "[part 4] SLA derived from Service Catalog for request %s: category=%r type=%r -> %r %r",
-                    req.id,
-                    req.request_category,
-                    req.request_type,
-                    req.sla_value,
-                    req.sla_unit,
-                )
-                sample_logged += 1
+        # (fully populated requests never reach this point)
+        filled_unit, filled_value = fill_missing_sla_fields(req, entry.unit, entry.value)
+
+        filled_unit_count += filled_unit
+        filled_value_count += filled_value
+        filled_requests += 1
 
+        # log only first N examples at INFO
+        if sample_logged < sample_limit:
+            logger.info(
+                "[part 4] SLA derived from Service Catalog for request %s: category=%r type=%r -> %r %r",
+                req.id,
+                req.request_category,
+                req.request_type,
+                req.sla_value,
+                req.sla_unit,
+            )
+            sample_logged += 1
+        elif debug_enabled:
+            # sampled requests are already logged at INFO above
             logger.debug(
                 "Derived SLA from Service Catalog for request %s: unit=%r value=%r",
                 req.id,
@@ -97,12 +122,13 @@ def fill_helpdesk_sla(requests: list[HelpdeskRequest], catalog: ServiceCatalog)
     # log summary if SLA was set from service catalog
     logger.info(
         "[part 4] SLA derivation summary: filled_requests=%d filled_unit=%d filled_value=%d "
-        "unknown_pairs=%d skipped_already_has_sla=%d",
+        "unknown_pairs=%d skipped_already_has_sla=%d skipped_unclassified=%d",
         filled_requests,
         filled_unit_count,
         filled_value_count,
         unknown_pair_count,
         skipped_already_has_sla_count,
+        unclassified_count,
     )
 
     # show a warning if there were unknown pairs
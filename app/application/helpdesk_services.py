@@ -9,16 +9,17 @@ logger = logging.getLogger(__name__)
 class HelpdeskService:
     def __init__(self, provider: HelpdeskRequestProvider) -> None:
         self._provider = provider
+        self._provider_name = type(provider).__name__
 
     def load_helpdesk_requests(self) -> Sequence[HelpdeskRequest]:
         logger.debug(
             "Loading helpdesk requests from provider %s",
-            type(self._provider).__name__,
+            self._provider_name,
         )
         requests_ = self._provider.fetch_requests()
         logger.debug(
             "Loaded %d helpdesk request(s) from provider %s",
             len(requests_),
-            type(self._provider).__name__,
+            self._provider_name,
         )
         return requests_
\ No newline at end of file
@@ -5,7 +5,7 @@ from app.domain.helpdesk import HelpdeskRequest
 from app.domain.service_catalog import ServiceCatalog
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LLMClassificationResult:
     request_category: Optional[str]
     request_type: Optional[str]
@@ -1,51 +1,100 @@
 from __future__ import annotations
 from dataclasses import dataclass
+from functools import lru_cache
 import re
-from app.domain.service_catalog import ServiceCatalog
+import sys
+from app.domain.service_catalog import ServiceCatalog, SLA
+from app.shared.normalization import PAIR_KEY_SEP
 
 
+_WS_RE = re.compile(r"\s+")
+
 # normalize strings for case-insensitive matching
+# (cached: LLM output repeats the same few category/type strings)
+@lru_cache(maxsize=4096)
 def _norm(value: str) -> str:
     value = value.strip()
-    value = re.sub(r"\s+", " ", value)
+    value = _WS_RE.sub(" ", value)
     return value.casefold()
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CatalogMatch:
     request_category: str
     request_type: str
 
+# marks a normalized key shared by different catalog entries
+_AMBIGUOUS = CatalogMatch(request_category="", request_type="")
+
 class ServiceCatalogMatcher:
     """Resolves (category, type) coming from LLM into canonical catalog strings."""
 
     def __init__(self, catalog: ServiceCatalog) -> None:
-        # NEW: map normalized pairs -> canonical pair
-        pair_map: dict[tuple[str, str], CatalogMatch] = {}
-
+        # normalize every catalog pair once (category names once per category, not
+        # per request type); intern canonical and normalized names so equal names
+        # share one string object
+        norm_pairs: list[tuple[str, str, str, str, SLA]] = []
         for category in catalog.categories:
-            cat_norm = _norm(category.name)
+            cat_norm = sys.intern(_norm(category.name))
+            category_name = sys.intern(category.name)
             for req_type in category.requests:
-                type_norm = _norm(req_type.name)
-                key = (cat_norm, type_norm)
-                canonical = CatalogMatch(
-                    request_category=category.name,
-                    request_type=req_type.name,
+                norm_pairs.append(
+                    (
+                        cat_norm,
+                        sys.intern(_norm(req_type.name)),
+                        category_name,
+                        sys.intern(req_type.name),
+                        req_type.sla,
+                    )
                 )
 
-                # protect against collisions (two entries normalize to same key)
-                if key in pair_map and pair_map[key] != canonical:
-                    pair_map[key] = CatalogMatch(request_category="", request_type="")
-                else:
-                    pair_map[key] = canonical
+        # map normalized pairs -> canonical pair + its catalog SLA
+        pair_map: dict[str, tuple[CatalogMatch, SLA]] = {}
+        for cat_norm, type_norm, category_name, type_name, sla in norm_pairs:
+            key = sys.intern(cat_norm + PAIR_KEY_SEP + type_norm)
+            canonical = CatalogMatch(
+                request_category=category_name,
+                request_type=type_name,
+            )
+
+            # protect against collisions (two entries normalize to same key)
+            existing = pair_map.get(key)
+            if existing is not None and existing[0] != canonical:
+                pair_map[key] = (_AMBIGUOUS, sla)
+            else:
+                pair_map[key] = (canonical, sla)
 
         self._pair_map = pair_map
+        # raw "category<SEP>type" -> resolved match, skips normalization for repeated pairs.
+        # seeded with canonical spellings: LLM output mostly echoes catalog names verbatim
+        self._resolve_cache: dict[str, tuple[CatalogMatch, SLA] | None] = {}
+        for cat_norm, type_norm, category_name, type_name, _ in norm_pairs:
+            match = pair_map[cat_norm + PAIR_KEY_SEP + type_norm]
+            self._resolve_cache[category_name + PAIR_KEY_SEP + type_name] = (
+                None if match[0] is _AMBIGUOUS else match
+            )
 
     def resolve(self, request_category: str | None, request_type: str | None) -> CatalogMatch | None:
+        resolved = self.resolve_with_sla(request_category, request_type)
+        return None if resolved is None else resolved[0]
+
+    def resolve_with_sla(
+        self,
+        request_category: str | None,
+        request_type: str | None,
+    ) -> tuple[CatalogMatch, SLA] | None:
+        """Like ``resolve``, but also returns the catalog SLA of the matched pair."""
+
         if not request_category or not request_type:
             return None
 
-        key = (_norm(request_category), _norm(request_type))
-        match = self._pair_map.get(key)
-        if not match or not match.request_category:
-            return None
+        raw_key = request_category + PAIR_KEY_SEP + request_type
+        try:
+            return self._resolve_cache[raw_key]
+        except KeyError:
+            pass
+
+        match = self._pair_map.get(_norm(request_category) + PAIR_KEY_SEP + _norm(request_type))
+        if not match or not match[0].request_category:
+            match = None
+        self._resolve_cache[raw_key] = match
         return match
\ No newline at end of file
@@ -68,6 +68,9 @@ def _build_pipeline_deps() -> PipelineDeps:
         email_sender=email_sender,
         codebase_url="https://github.com/Steaxy/automated_ticket_attribution",
         candidate_name=email_config.candidate_name,
+        llm_concurrency=llm_config.concurrency,
+        llm_max_batch_tokens=llm_config.max_batch_tokens,
+        llm_batch_mode=llm_config.batch_mode,
     )
 
 def pipeline(explicit_report_path: str | None = None) -> None:
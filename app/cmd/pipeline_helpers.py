@@ -1,5 +1,7 @@
 from __future__ import annotations
 import logging
+import os
+import stat
 from app.domain.helpdesk import HelpdeskRequest
 from app.application.send_report import send_report
 from datetime import datetime
@@ -34,6 +36,10 @@ def _log_sample_requests(requests_: Sequence[HelpdeskRequest], limit: int = 5) -
         This is intended to give quick visibility into the incoming data shape.
         """
 
+    # skip slicing and argument building when INFO is suppressed
+    if not logger.isEnabledFor(logging.INFO):
+        return
+
     for req in requests_[:limit]:
         logger.info(
             "[part 1] Request ID=%s short_description=%r",
@@ -68,10 +74,10 @@ def _send_report(
         candidate_name=candidate_name,
     )
 
-    # mark the resolved paths as sent
+    # mark the resolved paths as sent (one transaction for all of them)
     now = datetime.now()
+    report_log.mark_sent_many(attachment_paths, created_at=now)
     for report in attachment_paths:
-        report_log.mark_sent(report, created_at=now)
         logger.info(
             "Classified report %s marked as sent in log at %s",
             report.name,
@@ -105,15 +111,23 @@ def _collect_unsent_reports(
         if not output_dir.is_dir():
             return [], None
 
-        candidates = sorted(
-            output_dir.glob("*.xlsx"),
-            key=lambda p: p.stat().st_mtime,
-        )
+        # scandir yields cached d_type info, so only one stat() per report (for mtime)
+        with os.scandir(output_dir) as entries:
+            dated_candidates = [
+                (entry.stat().st_mtime, Path(entry.path))
+                for entry in entries
+                if entry.name.endswith(".xlsx") and entry.is_file()
+            ]
+        dated_candidates.sort()
+        candidates = [path for _, path in dated_candidates]
         explicit_report_path = None
 
+    # one bulk lookup instead of a query per candidate
+    records = report_log.get_records(candidates)
+
     unsent_report_paths: list[Path] = []
     for candidate in candidates:
-        record = report_log.get_record(candidate)
+        record = records.get(candidate)
         if record is None:
             unsent_report_paths.append(candidate)
         else:
@@ -128,12 +142,18 @@ def _collect_unsent_reports(
 def _resolve_report_paths(report_paths: Iterable[Path]) -> list[Path]:
     """Validate that all given report paths exist and return their absolute paths.
         Raises FileNotFoundError if any of the paths does not point to an existing
-        file. All returned paths are resolved to absolute Paths.
+        file. All returned paths are absolute Paths.
         """
 
+    # one stat() per path; abspath is pure string work (resolve() would
+    # walk every path segment for symlinks, which reports do not use)
     paths: list[Path] = []
     for path in report_paths:
-        if not path.is_file():
+        try:
+            is_file = stat.S_ISREG(os.stat(path).st_mode)
+        except OSError:
+            is_file = False
+        if not is_file:
             raise FileNotFoundError(f"Report file does not exist: {path}")
-        paths.append(path.resolve())
+        paths.append(Path(os.path.abspath(path)))
     return paths
\ No newline at end of file
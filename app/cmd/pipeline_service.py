@@ -4,6 +4,9 @@ from app.application.fill_helpdesk_sla import fill_helpdesk_sla
 from app.application.classify_helpdesk_requests import classify_requests
 from app.cmd.spinner import Spinner
 from pathlib import Path
+from collections.abc import Sequence
+from app.domain.helpdesk import HelpdeskRequest
+from app.domain.service_catalog import ServiceCatalog
 from app.cmd.pipeline_helpers import (
     _load_service_catalog,
     _log_sample_requests,
@@ -11,6 +14,7 @@ from app.cmd.pipeline_helpers import (
     _collect_unsent_reports,
 )
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 from app.application.ports.email_body_builder_port import EmailBodyBuilder
 from app.application.classify_helpdesk_requests import RequestClassifier
 from app.cmd.ports import ReportLogPort, ServiceCatalogClientPort, HelpdeskServicePort
@@ -34,6 +38,31 @@ class PipelineDeps:
     email_sender: ReportEmailSenderPort
     codebase_url: str
     candidate_name: str
+    llm_concurrency: int = 1
+    llm_max_batch_tokens: int = 0
+    llm_batch_mode: bool = False
+
+def _fetch_requests_and_catalog(deps: PipelineDeps) -> tuple[Sequence[HelpdeskRequest], ServiceCatalog]:
+    """Fetch helpdesk requests and the Service Catalog concurrently.
+
+        Both are independent network calls, so the catalog loads on a worker
+        thread while requests load on the caller thread; errors from either
+        propagate unchanged.
+        """
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        service_catalog_future = executor.submit(_load_service_catalog, deps.service_catalog_client)
+        try:
+            requests_ = deps.helpdesk_service.load_helpdesk_requests()
+        except BaseException:
+            # don't start the catalog fetch if it's still queued
+            service_catalog_future.cancel()
+            raise
+
+        # re-raises any error from the worker
+        service_catalog = service_catalog_future.result()
+
+    return requests_, service_catalog
 
 def run_pipeline(deps: PipelineDeps, explicit_report_path: str | None = None) -> None:
     project_root = deps.project_root
@@ -74,11 +103,8 @@ def run_pipeline(deps: PipelineDeps, explicit_report_path: str | None = None) ->
         )
         return
 
-    # [part 1] fetch helpdesk requests
-    requests_ = deps.helpdesk_service.load_helpdesk_requests()
-
-    # [part 2] fetch service catalog
-    service_catalog = _load_service_catalog(deps.service_catalog_client)
+    # [part 1] fetch helpdesk requests, [part 2] fetch service catalog
+    requests_, service_catalog = _fetch_requests_and_catalog(deps)
 
     # [part 3 and 4] classify the requests by LLM
     # classify all requests (even if not success by LLM) and log first 3 of them
@@ -89,9 +115,14 @@ def run_pipeline(deps: PipelineDeps, explicit_report_path: str | None = None) ->
             service_catalog,
             requests_,
             batch_size=deps.batch_size,
+            concurrency=deps.llm_concurrency,
+            max_batch_tokens=deps.llm_max_batch_tokens,
+            batch_mode=deps.llm_batch_mode,
         )
 
     # [part 5] build Excel file
+    # classified pairs already carry SLA; this covers requests that came in
+    # pre-categorized but whose LLM batch failed or returned no result
     fill_helpdesk_sla(classified_requests, service_catalog)
     try:
         report_path = deps.report_exporter.export(classified_requests)
@@ -1,6 +1,6 @@
 from typing import Any, Protocol
 from pathlib import Path
-from collections.abc import Sequence
+from collections.abc import Mapping, Sequence
 from app.domain.helpdesk import HelpdeskRequest
 
 
@@ -12,9 +12,15 @@ class ReportLogPort(Protocol):
     def get_record(self, path: Path) -> Any:
         ...
 
+    def get_records(self, paths: Sequence[Path]) -> Mapping[Path, Any]:
+        ...
+
     def mark_sent(self, path: Path, created_at: Any) -> None:
         ...
 
+    def mark_sent_many(self, paths: Sequence[Path], created_at: Any) -> None:
+        ...
+
 class HelpdeskServicePort(Protocol):
     def load_helpdesk_requests(self) -> Sequence[HelpdeskRequest]:
         ...
\ No newline at end of file
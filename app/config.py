@@ -15,6 +15,7 @@ class HelpdeskAPIConfig:
 class ServiceCatalogConfig:
     url: str
     timeout_seconds: float = 10.0
+    cache_path: str | None = None
 
 # LLM
 @dataclass(frozen=True)
@@ -26,9 +27,13 @@ class LLMConfig:
     temperature: float = 0.0
     top_p: float = 1.0
     top_k: int = 1
+    concurrency: int = 1
+    max_batch_tokens: int = 0
+    max_retries: int = 1
+    batch_mode: bool = False
 
 # email
-@dataclass
+@dataclass(frozen=True)
 class EmailConfig:
     smtp_host: str
     smtp_port: int
@@ -1,24 +1,38 @@
 from __future__ import annotations
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field
 from typing import List
+from app.shared.normalization import PAIR_KEY_SEP
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SLA:
     unit: str
     value: int
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ServiceRequestType:
     name: str
     sla: SLA
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ServiceCategory:
     name: str
     requests: List[ServiceRequestType]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ServiceCatalog:
-    categories: List[ServiceCategory]
\ No newline at end of file
+    categories: List[ServiceCategory]
+    # "category<SEP>request_type" -> SLA, built once at construction for exact-name lookups
+    sla_index: dict[str, SLA] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "sla_index", {
+            sys.intern(category.name + PAIR_KEY_SEP + req_type.name): req_type.sla
+            for category in self.categories
+            for req_type in category.requests
+        })
+
+    def get_sla(self, category: str, request_type: str) -> SLA | None:
+        return self.sla_index.get(category + PAIR_KEY_SEP + request_type)
@@ -1,11 +1,13 @@
 from __future__ import annotations
 import logging
+from collections.abc import Iterable, Sequence
 from io import BytesIO
-from typing import Iterable, List
+from typing import List
 from openpyxl import Workbook
 from openpyxl.styles import Font, Border, Side, PatternFill
 from openpyxl.utils import get_column_letter
 from app.domain.helpdesk import HelpdeskRequest
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.worksheet.worksheet import Worksheet
 
 
@@ -14,41 +16,39 @@ logger = logging.getLogger(__name__)
 class ExcelReportError(RuntimeError):
     """Raised when the Excel report cannot be generated."""
 
+# styles are built once and shared by every cell and workbook;
+# openpyxl registers each distinct style in the workbook's style table by value
+_HEADER_FONT = Font(bold=True, size=14)
+_DEFAULT_FONT = Font(size=14)
+_HEADER_FILL = PatternFill(fill_type="solid", fgColor="FFC000")
+_BORDER_SIDE = Side(border_style="thin", color="000000")
+_DEFAULT_BORDER = Border(
+    left=_BORDER_SIDE,
+    right=_BORDER_SIDE,
+    top=_BORDER_SIDE,
+    bottom=_BORDER_SIDE,
+)
+
+# key= is evaluated once per request (decorate-sort-undecorate), so each field
+# is lowered N times in total, never per comparison
+def _report_sort_key(req: HelpdeskRequest) -> tuple[str, str, str]:
+    return (
+        (req.request_category or "").lower(),
+        (req.request_type or "").lower(),
+        (req.short_description or "").lower(),
+    )
+
 def build_excel(requests: Iterable[HelpdeskRequest]) -> bytes:
 
     # sorts by request_category, request_type, short_description (ascending).
-    sorted_requests: List[HelpdeskRequest] = sorted(
-        requests,
-        key=lambda r: (
-            (r.request_category or "").lower(),
-            (r.request_type or "").lower(),
-            (r.short_description or "").lower(),
-        ),
-    )
+    sorted_requests: List[HelpdeskRequest] = sorted(requests, key=_report_sort_key)
 
-    wb = Workbook()
-
-    ws_raw = wb.active
-    if ws_raw is None or not isinstance(ws_raw, Worksheet):
-        logger.error("Active sheet is not a Worksheet or is None: %r", ws_raw)
-        raise ExcelReportError("Failed to get active worksheet")
-    ws: Worksheet = ws_raw
-
-    ws.title = "Helpdesk Requests"
-
-    # styles
-    header_font = Font(bold=True, size=14)
-    default_font = Font(size=14)
-    header_fill = PatternFill(fill_type="solid", fgColor="FFC000")
-    border_side = Side(border_style="thin", color="000000")
-    default_border = Border(
-        left=border_side,
-        right=border_side,
-        top=border_side,
-        bottom=border_side,
-    )
+    # write-only workbook: rows are streamed to the sheet XML instead of being
+    # kept as a grid of Cell objects
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Helpdesk Requests")
 
-    # define and write header
+    # define header
     headers = [
         "id",
         "request_category",
@@ -57,40 +57,48 @@ def build_excel(requests: Iterable[HelpdeskRequest]) -> bytes:
         "sla_value",
         "sla_unit",
     ]
-    ws.append(headers)
-
-    # write data rows
-    for req in sorted_requests:
-        ws.append(
-            [
-                req.id or "",
-                req.request_category or "",
-                req.request_type or "",
-                req.short_description or "",
-                req.sla_value if req.sla_value is not None else "",
-                req.sla_unit or "",
-            ]
+
+    # data rows as plain value tuples
+    rows: list[tuple[str | int, ...]] = [
+        (
+            req.id or "",
+            req.request_category or "",
+            req.request_type or "",
+            req.short_description or "",
+            req.sla_value if req.sla_value is not None else "",
+            req.sla_unit or "",
         )
+        for req in sorted_requests
+    ]
 
-    # apply styles
-    for row_idx, row in enumerate(
-            ws.iter_rows(
-                min_row=1,
-                max_row=ws.max_row,
-                max_col=ws.max_column,
-            ),
-            start=1,
-    ):
-        for cell in row:
-            cell.border = default_border
-            if row_idx == 1:
-                cell.font = header_font
-                cell.fill = header_fill
-            else:
-                cell.font = default_font
-
-    # auto-fit by setting column width from max content length
-    _auto_fit_columns(ws)
+    # auto-fit by setting column width from max content length;
+    # write-only sheets emit column widths with the first row, so set them before appending
+    _auto_fit_columns(ws, headers, rows)
+
+    # write header and data rows with styles
+    header_cells = []
+    for header in headers:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.font = _HEADER_FONT
+        cell.fill = _HEADER_FILL
+        cell.border = _DEFAULT_BORDER
+        header_cells.append(cell)
+    ws.append(header_cells)
+
+    # one styled cell per column, reused for every row. Only safe on this write-only
+    # sheet: its append() serializes the row immediately, so the cells are free again
+    # once it returns (a regular sheet would keep references to them)
+    data_cells = []
+    for _ in headers:
+        cell = WriteOnlyCell(ws)
+        cell.font = _DEFAULT_FONT
+        cell.border = _DEFAULT_BORDER
+        data_cells.append(cell)
+
+    for row in rows:
+        for cell, value in zip(data_cells, row):
+            cell.value = value
+        ws.append(data_cells)
 
     with BytesIO() as buffer:
         try:
@@ -100,34 +108,23 @@ def build_excel(requests: Iterable[HelpdeskRequest]) -> bytes:
             raise ExcelReportError("Failed to build Excel report") from exc
         return buffer.getvalue()
 
-def _auto_fit_columns(ws: Worksheet) -> None:
+# annotated with the public Worksheet type; write-only sheets reuse its _setup, column_dimensions included
+def _auto_fit_columns(
+        ws: Worksheet,
+        headers: Sequence[str],
+        rows: Iterable[Sequence[str | int]],
+) -> None:
     padding = 6
     min_width = 14
 
-    for column_cells in ws.columns:
-        first_cell = column_cells[0]
-        col_index = first_cell.column
-        if not isinstance(col_index, int):
-            logger.warning(
-                "Unexpected column index type %r for cell %r; skipping column",
-                col_index,
-                first_cell,
-            )
-            continue
+    # transpose once and let max/map/len run the per-cell work in C
+    max_lengths = [len(header) for header in headers]
+    for col_offset, column in enumerate(zip(*rows)):
+        max_lengths[col_offset] = max(max_lengths[col_offset], max(map(len, map(str, column))))
 
+    for col_index, max_length in enumerate(max_lengths, start=1):
         column_letter = get_column_letter(col_index)
 
-        max_length = 0
-        for cell in column_cells:
-            value = cell.value
-            if value is None:
-                continue
-
-            value_str = str(value)
-            length = len(value_str)
-            if length > max_length:
-                max_length = length
-
         if max_length == 0:
             width = min_width
         else:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
 from app.config import (
     HelpdeskAPIConfig,
@@ -10,6 +11,8 @@ from app.config import (
 )
 
 
+# .env is parsed once at import; the loaders below are memoized because the
+# environment is fixed for the lifetime of the process (configs are frozen)
 load_dotenv()
 
 def _get_required_env(name: str) -> str:
@@ -18,6 +21,7 @@ def _get_required_env(name: str) -> str:
         raise RuntimeError(f"Environment variable {name} is required but not set")
     return value
 
+@lru_cache(maxsize=1)
 def load_helpdesk_config() -> HelpdeskAPIConfig:
     url = _get_required_env("HELPDESK_API_URL")
     api_key = _get_required_env("HELPDESK_API_KEY")
@@ -29,13 +33,18 @@ def load_helpdesk_config() -> HelpdeskAPIConfig:
         api_secret=api_secret,
     )
 
+@lru_cache(maxsize=1)
 def load_service_catalog_config() -> ServiceCatalogConfig:
     url = _get_required_env("SERVICE_CATALOG_URL")
+    # optional on-disk copy of the parsed catalog, revalidated with a conditional GET
+    cache_path = os.getenv("SERVICE_CATALOG_CACHE_PATH") or None
 
     return ServiceCatalogConfig(
         url=url,
+        cache_path=cache_path,
     )
 
+@lru_cache(maxsize=1)
 def load_llm_config() -> LLMConfig:
     model_name = _get_required_env("LLM_MODEL_NAME")
     api_key = _get_required_env("LLM_API_KEY")
@@ -52,6 +61,35 @@ def load_llm_config() -> LLMConfig:
     except ValueError as exc:
         raise RuntimeError("LLM_BATCH_SIZE must be an integer") from exc
 
+    concurrency_str = os.getenv("LLM_CONCURRENCY", "1")
+    try:
+        concurrency = int(concurrency_str)
+    except ValueError as exc:
+        raise RuntimeError("LLM_CONCURRENCY must be an integer") from exc
+    if concurrency < 1:
+        raise RuntimeError("LLM_CONCURRENCY must be >= 1")
+
+    # 0 disables the token budget (batches are capped by LLM_BATCH_SIZE only)
+    max_batch_tokens_str = os.getenv("LLM_MAX_BATCH_TOKENS", "0")
+    try:
+        max_batch_tokens = int(max_batch_tokens_str)
+    except ValueError as exc:
+        raise RuntimeError("LLM_MAX_BATCH_TOKENS must be an integer") from exc
+    if max_batch_tokens < 0:
+        raise RuntimeError("LLM_MAX_BATCH_TOKENS must be >= 0")
+
+    # total attempts per batch call; 1 disables retries
+    max_retries_str = os.getenv("LLM_MAX_RETRIES", "1")
+    try:
+        max_retries = int(max_retries_str)
+    except ValueError as exc:
+        raise RuntimeError("LLM_MAX_RETRIES must be an integer") from exc
+    if max_retries < 1:
+        raise RuntimeError("LLM_MAX_RETRIES must be >= 1")
+
+    # one asynchronous provider batch job per run instead of online calls
+    batch_mode = os.getenv("LLM_BATCH_MODE", "false").lower() in ("1", "true", "yes", "y")
+
     temperature_str = os.getenv("LLM_TEMPERATURE", "0.0")
     top_p_str = os.getenv("LLM_TOP_P", "1.0")
     top_k_str = os.getenv("LLM_TOP_K", "1")
@@ -78,8 +116,13 @@ def load_llm_config() -> LLMConfig:
         temperature=temperature,
         top_p=top_p,
         top_k=top_k,
+        concurrency=concurrency,
+        max_batch_tokens=max_batch_tokens,
+        max_retries=max_retries,
+        batch_mode=batch_mode,
     )
 
+@lru_cache(maxsize=1)
 def load_email_config() -> EmailConfig:
     smtp_host = _get_required_env("EMAIL_SMTP_HOST")
     smtp_port_str = _get_required_env("EMAIL_SMTP_PORT")
@@ -106,6 +149,7 @@ def load_email_config() -> EmailConfig:
         candidate_name=candidate_name,
     )
 
+@lru_cache(maxsize=1)
 def load_report_log_config() -> ReportLogConfig:
     db_path = _get_required_env("REPORT_LOG_DB_PATH")
     return ReportLogConfig(db_path=db_path)
@@ -1,8 +1,11 @@
 from __future__ import annotations
 import logging
 import mimetypes
+import mmap
+import os
 import smtplib
 import ssl
+from collections.abc import Iterable
 from email.message import EmailMessage
 from pathlib import Path
 from app.config import EmailConfig
@@ -31,14 +34,6 @@ class SMTPSender(ReportEmailSenderPort):
             if not report.is_file():
                 raise EmailSendError(f"Attachment does not exist: {report}")
 
-        total_size = sum(p.stat().st_size for p in attachments)
-        logger.info(
-            "Preparing email to %s with %d attachment(s) (total %d bytes)",
-            self._config.recipient,
-            len(attachments),
-            total_size,
-        )
-
         msg = EmailMessage()
         msg["Subject"] = subject
         msg["From"] = self._config.sender
@@ -48,23 +43,22 @@ class SMTPSender(ReportEmailSenderPort):
         if html_body:
             msg.add_alternative(html_body, subtype="html")
 
+        total_size = 0
         for report in attachments:
-            mime_type, _ = mimetypes.guess_type(report.name)
-            if mime_type is None:
-                maintype, subtype = "application", "octet-stream"
-            else:
-                maintype, subtype = mime_type.split("/", 1)
-
-            with report.open("rb") as f:
-                file_bytes = f.read()
-
-            msg.add_attachment(
-                file_bytes,
-                maintype=maintype,
-                subtype=subtype,
-                filename=report.name,
-            )
+            total_size += _attach_file(msg, report)
 
+        logger.info(
+            "Prepared email to %s with %d attachment(s) (total %d bytes)",
+            self._config.recipient,
+            len(attachments),
+            total_size,
+        )
+
+        self.send_many([msg])
+        logger.info("Report email successfully sent to %s", self._config.recipient)
+
+    # send several prepared messages over one SMTP connection (one TLS handshake + login)
+    def send_many(self, messages: Iterable[EmailMessage]) -> int:
         logger.info(
             "Connecting to SMTP server %s:%s (TLS=%s)...",
             self._config.smtp_host,
@@ -72,6 +66,7 @@ class SMTPSender(ReportEmailSenderPort):
             self._config.use_tls,
         )
 
+        sent_count = 0
         try:
             context = ssl.create_default_context()
             with smtplib.SMTP(self._config.smtp_host, self._config.smtp_port) as smtp:
@@ -79,10 +74,37 @@ class SMTPSender(ReportEmailSenderPort):
                     smtp.starttls(context=context)
 
                 smtp.login(self._config.username, self._config.password)
-                smtp.send_message(msg)
+                for msg in messages:
+                    smtp.send_message(msg)
+                    sent_count += 1
 
         except smtplib.SMTPException as exc:
             logger.exception("Failed to send report email via SMTP")
             raise EmailSendError("Failed to send report email") from exc
 
-        logger.info("Report email successfully sent to %s", self._config.recipient)
\ No newline at end of file
+        return sent_count
+
+def _attach_file(msg: EmailMessage, report: Path) -> int:
+    """Attach ``report`` to ``msg`` and return its size in bytes.
+
+        The file is memory-mapped instead of read into a bytes copy, so only the
+        base64-encoded form is held in memory alongside the page cache.
+        """
+
+    mime_type, _ = mimetypes.guess_type(report.name)
+    if mime_type is None:
+        maintype, subtype = "application", "octet-stream"
+    else:
+        maintype, subtype = mime_type.split("/", 1)
+
+    with report.open("rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            # empty files cannot be mapped
+            msg.add_attachment(b"", maintype=maintype, subtype=subtype, filename=report.name)
+            return 0
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+            msg.add_attachment(view, maintype=maintype, subtype=subtype, filename=report.name)
+
+    return size
@@ -1,4 +1,5 @@
 from __future__ import annotations
+from functools import cache
 from html import escape
 from importlib import resources
 from app.application.ports.email_body_builder_port import EmailBodyBuilder
@@ -9,6 +10,9 @@ class EmailTemplateError(RuntimeError):
 
 TEMPLATES_PACKAGE = "app.infrastructure.email_templates"
 
+# templates are immutable at runtime: read + decode each file once per process
+# (failures are not cached, so a missing template is retried on the next call)
+@cache
 def _load_template(filename: str) -> str:
     try:
         return resources.files(TEMPLATES_PACKAGE).joinpath(filename).read_text(
@@ -1,16 +1,21 @@
 from __future__ import annotations
 import logging
 from typing import Any
+import orjson
 import requests
 from requests import HTTPError, RequestException
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from app.config import HelpdeskAPIConfig
 from app.domain.helpdesk import HelpdeskRequest
-import time
 from app.application.dto.fetched_helpdesk_request import FetchedHelpdeskRequest
 
 
 logger = logging.getLogger(__name__)
 
+# transient statuses retried by the session adapter
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
 class HelpdeskAPIError(RuntimeError):
     """Raised when Helpdesk API cannot be called or its response cannot be parsed/validated."""
 
@@ -26,15 +31,29 @@ class HelpdeskClient:
         config: HelpdeskAPIConfig,
         max_retries: int = 3,
         backoff_factor: float = 0.5,
+        session: requests.Session | None = None,
     ) -> None:
         self._config = config
-        self._session = requests.Session()
         self._max_retries = max_retries
         self._backoff_factor = backoff_factor
+        # an injected session gets the same adapter, so max_retries holds either way
+        self._session = session if session is not None else requests.Session()
+
+        # keep-alive pool + retries with exponential backoff handled by urllib3;
+        # max_retries counts total attempts, urllib3's total counts retries after the first
+        retry = Retry(
+            total=max(max_retries - 1, 0),
+            backoff_factor=backoff_factor,
+            status_forcelist=_RETRY_STATUSES,
+            allowed_methods=frozenset({"POST"}),
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=retry)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
 
     def _post_json(self) -> Any:
         """Call the Helpdesk API and return the parsed JSON body.
-            Retries on HTTP/network failures with exponential backoff.
+            Retries on HTTP/network failures with exponential backoff (session adapter).
             Raises:
                 HelpdeskAPIError: on request failures after retries or invalid JSON.
             """
@@ -44,49 +63,25 @@ class HelpdeskClient:
             "api_secret": self._config.api_secret,
         }
 
-        # retry POST with exponential backoff on HTTP/network errors
-        response: requests.Response | None = None
-        last_exc: Exception | None = None
-
-        for attempt in range(1, self._max_retries + 1):
-            try:
-                response = self._session.post(
-                    self._config.url,
-                    json=payload,
-                    timeout=self._config.timeout_seconds,
-                )
-                response.raise_for_status()
-                break
-            except (HTTPError, RequestException) as exc:
-                last_exc = exc
-                if attempt == self._max_retries:
-                    msg = (
-                        f"Error calling Helpdesk API after {self._max_retries} "
-                        f"attempts: {exc}"
-                    )
-                    logger.error(msg)
-                    raise HelpdeskAPIError(msg) from exc
-
-                sleep_seconds = self._backoff_factor * (2 ** (attempt - 1))
-                logger.warning(
-                    "Helpdesk API call failed on attempt %d/%d: %s; "
-                    "retrying in %.1f seconds",
-                    attempt,
-                    self._max_retries,
-                    exc,
-                    sleep_seconds,
-                )
-                time.sleep(sleep_seconds)
-
-        if response is None:
-            msg = "Helpdesk API call failed without a response object"
+        try:
+            response = self._session.post(
+                self._config.url,
+                json=payload,
+                timeout=self._config.timeout_seconds,
+            )
+            response.raise_for_status()
+        except (HTTPError, RequestException) as exc:
+            msg = (
+                f"Error calling Helpdesk API (up to {self._max_retries} "
+                f"attempts): {exc}"
+            )
             logger.error(msg)
-            if last_exc is not None:
-                raise HelpdeskAPIError(msg) from last_exc
-            raise HelpdeskAPIError(msg)
+            raise HelpdeskAPIError(msg) from exc
 
+        # orjson parses straight from the response bytes (no decoded str copy);
+        # orjson.JSONDecodeError subclasses ValueError
         try:
-            return response.json()
+            return orjson.loads(response.content)
         except ValueError as exc:
             msg = "Failed to parse Helpdesk API response as JSON"
             logger.error(msg)
@@ -100,48 +95,41 @@ class HelpdeskClient:
         """Fetch helpdesk requests and map them into domain + raw envelope."""
 
         data = self._post_json()
-        logger.info(
-            "Raw Helpdesk API response keys: %s",
-            list(data.keys()) if isinstance(data, dict) else type(data),
-        )
+        # the keys list is only built when the line is actually emitted
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Raw Helpdesk API response keys: %s",
+                list(data.keys()) if isinstance(data, dict) else type(data),
+            )
 
         items = self._extract_items(data)
 
+        # bind helpers/methods to locals once; the loop body runs per API item
+        norm_str = _normalize_optional_str
+        norm_int = _normalize_optional_int
         result: list[FetchedHelpdeskRequest] = []
+        append = result.append
         for item in items:
-            id = _normalize_optional_str(item.get("id") or item.get("ticket_id"))
-            short_description = _normalize_optional_str(item.get("short_description") or item.get("subject"))
-
-            long_description = _normalize_optional_str(
-                item.get("long_description") or item.get("description") or item.get("body")
-            )
-
-            request_category = _normalize_optional_str(item.get("request_category"))
-            request_type = _normalize_optional_str(item.get("request_type"))
-
-            sla_payload = item.get("sla")
-            sla_unit: str | None = None
-            sla_value: int | None = None
+            get = item.get
+            sla_payload = get("sla")
             if isinstance(sla_payload, dict):
-                sla_unit = _normalize_optional_str(sla_payload.get("unit"))
-                sla_value = _normalize_optional_int(sla_payload.get("value"))
+                sla_unit = norm_str(sla_payload.get("unit"))
+                sla_value = norm_int(sla_payload.get("value"))
+            else:
+                sla_unit = None
+                sla_value = None
 
             domain_req = HelpdeskRequest(
-                id=id,
-                short_description=short_description,
-                long_description=long_description,
-                request_category=request_category,
-                request_type=request_type,
+                id=norm_str(get("id") or get("ticket_id")),
+                short_description=norm_str(get("short_description") or get("subject")),
+                long_description=norm_str(get("long_description") or get("description") or get("body")),
+                request_category=norm_str(get("request_category")),
+                request_type=norm_str(get("request_type")),
                 sla_unit=sla_unit,
                 sla_value=sla_value,
             )
 
-            result.append(
-                FetchedHelpdeskRequest(
-                    request=domain_req,
-                    raw_payload=item,
-                )
-            )
+            append(FetchedHelpdeskRequest(request=domain_req, raw_payload=item))
 
         logger.info("Fetched %d helpdesk requests", len(result))
         return result
@@ -156,42 +144,52 @@ class HelpdeskClient:
                 HelpdeskAPIError: if no supported shape matches.
             """
 
-        if isinstance(data, list):
-            return [item for item in data if isinstance(item, dict)]
-
-        if isinstance(data, dict):
-            payload = data.get("data", data)
-
-            if isinstance(payload, list):
-                return [item for item in payload if isinstance(item, dict)]
-
-            if isinstance(payload, dict):
-                items_payload = payload.get("requests")
-                if isinstance(items_payload, list):
-                    return [item for item in items_payload if isinstance(item, dict)]
+        # supported shapes are declared once as patterns; the mapping patterns
+        # compile to key lookups + type checks, no intermediate .get() chains
+        match data:
+            case list():
+                return _dict_items(data)
+            case {"data": list() as items_payload}:
+                return _dict_items(items_payload)
+            case {"data": {"requests": list() as items_payload}}:
+                return _dict_items(items_payload)
+            case {"requests": list() as items_payload} if "data" not in data:
+                return _dict_items(items_payload)
+            case dict():
+                payload = data.get("data", data)
+                if isinstance(payload, dict):
+                    logger.error(
+                        "Helpdesk API 'data' dict has no 'requests' list. data keys=%s, payload keys=%s",
+                        list(data.keys()),
+                        list(payload.keys()),
+                    )
+                    raise HelpdeskAPIError(
+                        "Unexpected response shape from Helpdesk API: "
+                        "'data.requests' key missing or not a list"
+                    )
 
                 logger.error(
-                    "Helpdesk API 'data' dict has no 'requests' list. data keys=%s, payload keys=%s",
-                    list(data.keys()),
-                    list(payload.keys()),
+                    "Helpdesk API 'data' has unexpected type: %s",
+                    type(payload).__name__,
                 )
                 raise HelpdeskAPIError(
-                    "Unexpected response shape from Helpdesk API: "
-                    "'data.requests' key missing or not a list"
+                    "Unexpected response shape from Helpdesk API: 'data' is not dict or list"
                 )
 
-            logger.error(
-                "Helpdesk API 'data' has unexpected type: %s",
-                type(payload).__name__,
-            )
-            raise HelpdeskAPIError(
-                "Unexpected response shape from Helpdesk API: 'data' is not dict or list"
-            )
-
         msg = f"Unexpected response format from Helpdesk API: {type(data).__name__}"
         logger.error(msg)
         raise HelpdeskAPIError(msg)
 
+def _dict_items(items: list[Any]) -> list[dict[str, Any]]:
+    """Return ``items`` without non-dict entries.
+        Well-formed responses contain only dicts: the type check then runs in C
+        (map + set) and the parsed list is returned as-is instead of being copied.
+        """
+
+    if set(map(type, items)) <= {dict}:
+        return items
+    return [item for item in items if isinstance(item, dict)]
+
 def _normalize_optional_str(value: Any) -> str | None:
     """Return stripped string or None for empty/whitespace."""
     if value is None:
@@ -1,5 +1,5 @@
 from __future__ import annotations
-import json
+import orjson
 import logging
 from typing import Any
 from app.application.llm_classifier import (
@@ -14,11 +14,41 @@ from google.genai import types
 from app.shared.normalization import normalize_str_or_none
 from app.infrastructure.llm_classifier_prompt import LLM_BATCH_PROMPT_TEMPLATE
 from typing import Sequence
+import threading
 import time
 
 
 logger = logging.getLogger(__name__)
 
+# separates request blocks inside the prompt's requests section
+_REQUEST_SEPARATOR = "\n\n---\n\n"
+
+# malformed LLM items shown in the per-batch skip summary
+_SKIPPED_ITEMS_TO_LOG = 5
+
+# batch-mode job polling; a job may stay queued for hours, so poll sparingly
+_BULK_POLL_SECONDS = 30.0
+_BULK_DONE_STATES = frozenset({
+    types.JobState.JOB_STATE_SUCCEEDED,
+    types.JobState.JOB_STATE_PARTIALLY_SUCCEEDED,
+})
+# still worth polling; any other non-done state (failed, cancelled, unspecified, ...) fails fast
+_BULK_PENDING_STATES = frozenset({
+    types.JobState.JOB_STATE_QUEUED,
+    types.JobState.JOB_STATE_PENDING,
+    types.JobState.JOB_STATE_RUNNING,
+    types.JobState.JOB_STATE_UPDATING,
+    types.JobState.JOB_STATE_PAUSED,
+})
+# give up on a job that has not finished within Gemini's 24h batch turnaround target
+_BULK_MAX_WAIT_SECONDS = 24 * 3600.0
+
+# first retry of a failed LLM call waits this long; doubles per further attempt
+_RETRY_BACKOFF_SECONDS = 1.0
+
+# template split once around the only per-batch placeholder; '{catalog}' lives in the head
+_PROMPT_HEAD_TEMPLATE, _PROMPT_TAIL_TEMPLATE = LLM_BATCH_PROMPT_TEMPLATE.split("{requests_block}")
+
 class LLMClassifier:
     """Wrapper around the Google GenAI client for classifying helpdesk requests.
 
@@ -27,14 +57,102 @@ class LLMClassifier:
         objects keyed by id.
         """
 
-    def __init__(self, config: LLMConfig) -> None:
+    def __init__(self, config: LLMConfig, client: genai.Client | None = None) -> None:
         if not config.api_key:
             raise LLMClassificationError("LLM_API_KEY must be configured.")
 
         self._config = config
-        self._client = genai.Client(api_key=config.api_key)
+        self._client = client if client is not None else genai.Client(api_key=config.api_key)
         self._model = config.model_name
         self._delay_between_batches: float = config.delay_between_batches
+        self._max_retries: int = max(config.max_retries, 1)
+        # start time reserved for the next LLM call (shared by concurrent batch threads)
+        self._next_call_at = 0.0
+        self._rate_lock = threading.Lock()
+        # (catalog, prompt head, prompt tail) of the last prepared catalog
+        self._prepared_catalog: tuple[ServiceCatalog, str, str] | None = None
+
+    def prepare(self, catalog: ServiceCatalog) -> tuple[str, str]:
+        """Render the prompt around the requests block once per catalog.
+
+            Returns ``(head, tail)`` such that ``head + requests_block + tail`` is the
+            full batch prompt. Called lazily by ``classify_batch``; the rendered parts
+            are reused for as long as the same catalog object is passed in.
+            """
+
+        prepared = self._prepared_catalog
+        if prepared is not None and prepared[0] is catalog:
+            return prepared[1], prepared[2]
+
+        catalog_fragment = _catalog_to_prompt_fragment(catalog)
+        # format() still runs on each half to unescape the '{{ }}' in the JSON example
+        head = _PROMPT_HEAD_TEMPLATE.format(catalog=catalog_fragment)
+        tail = _PROMPT_TAIL_TEMPLATE.format()
+        self._prepared_catalog = (catalog, head, tail)
+        logger.debug("Prepared Service Catalog prompt (%d chars)", len(head) + len(tail))
+        return head, tail
+
+    def _wait_for_call_slot(self) -> None:
+        """Space LLM call starts at least ``delay_between_batches`` apart.
+
+            Unlike sleeping after every call, time already spent waiting on the
+            previous response counts toward the delay, and nothing sleeps after
+            the last batch.
+            """
+
+        delay = self._delay_between_batches
+        if delay <= 0:
+            return
+
+        with self._rate_lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_call_at)
+            self._next_call_at = start_at + delay
+
+        wait = start_at - now
+        if wait > 0:
+            logger.debug("Waiting %.2f seconds before next LLM batch", wait)
+            time.sleep(wait)
+
+    def _generate_config(self) -> types.GenerateContentConfig:
+        return types.GenerateContentConfig(
+            response_mime_type="application/json",
+            temperature=self._config.temperature,
+            top_p=self._config.top_p,
+            top_k=self._config.top_k,
+        )
+
+    def _generate(self, prompt: str) -> Any:
+        """Send the prompt to the model, retrying API failures up to max_retries attempts.
+
+            The prompt is built once by the caller and reused as-is on every attempt.
+            """
+
+        generate_config = self._generate_config()
+        for attempt in range(1, self._max_retries + 1):
+            self._wait_for_call_slot()
+            try:
+                return self._client.models.generate_content(
+                    model=self._model,
+                    contents=prompt,
+                    config=generate_config,
+                )
+            except Exception as exc:
+                if attempt == self._max_retries:
+                    logger.error("LLM batch classification call failed: %s", exc)
+                    raise LLMClassificationError("LLM batch API call failed") from exc
+
+                sleep_seconds = _RETRY_BACKOFF_SECONDS * (2 ** (attempt - 1))
+                logger.warning(
+                    "LLM batch call failed on attempt %d/%d: %s; retrying in %.1f seconds",
+                    attempt,
+                    self._max_retries,
+                    exc,
+                    sleep_seconds,
+                )
+                time.sleep(sleep_seconds)
+
+        raise LLMClassificationError("LLM batch API call failed")
 
     def classify_helpdesk_request(self, request: HelpdeskRequest, catalog: ServiceCatalog) -> LLMClassificationResult:
         """Classify a single helpdesk request using the LLM.
@@ -67,6 +185,108 @@ class LLMClassifier:
         )
         return next(iter(results.values()))
 
+    def classify_bulk(
+            self,
+            batches: Sequence[Sequence[HelpdeskRequest]],
+            catalog: ServiceCatalog,
+    ) -> list[dict[str, LLMClassificationResult] | None]:
+        """Classify all batches through one asynchronous Gemini batch job.
+
+            Each batch becomes one inlined request with the same prompt that
+            ``classify_batch`` would send; the job is polled until it finishes.
+            Returns one entry per batch, in order: its results keyed by id, or None
+            when that entry failed or its output was unusable.
+
+            Raises LLMClassificationError when the job cannot be created or does
+            not succeed.
+            """
+
+        if not batches:
+            return []
+
+        prompt_head, prompt_tail = self.prepare(catalog)
+        generate_config = self._generate_config()
+        src = [
+            types.InlinedRequest(
+                model=self._model,
+                contents=prompt_head + _build_batch(list(batch)) + prompt_tail,
+                config=generate_config,
+            )
+            for batch in batches
+        ]
+
+        try:
+            job = self._client.batches.create(model=self._model, src=src)
+        except Exception as exc:
+            logger.error("LLM batch job call failed: %s", exc)
+            raise LLMClassificationError("LLM batch job API call failed") from exc
+
+        job_name = job.name
+        if not job_name:
+            raise LLMClassificationError("LLM batch job was created without a name")
+        logger.info("[part 3] Submitted LLM batch job %s with %d prompt(s)", job_name, len(src))
+        deadline = time.monotonic() + _BULK_MAX_WAIT_SECONDS
+        while job.state not in _BULK_DONE_STATES:
+            if job.state not in _BULK_PENDING_STATES:
+                logger.error("LLM batch job %s ended in state %s: %s", job_name, job.state, job.error)
+                raise LLMClassificationError(f"LLM batch job ended in state {job.state}")
+            if time.monotonic() >= deadline:
+                logger.error(
+                    "LLM batch job %s still in state %s after %.0f seconds; giving up "
+                    "(the job keeps running and its results can still be fetched by name)",
+                    job_name,
+                    job.state,
+                    _BULK_MAX_WAIT_SECONDS,
+                )
+                raise LLMClassificationError(f"LLM batch job {job_name} did not finish in time")
+            time.sleep(_BULK_POLL_SECONDS)
+            job = self._get_bulk_job(job_name)
+
+        responses = (job.dest.inlined_responses if job.dest is not None else None) or []
+        if len(responses) != len(batches):
+            logger.error(
+                "LLM batch job %s returned %d response(s) for %d prompt(s)",
+                job_name,
+                len(responses),
+                len(batches),
+            )
+            raise LLMClassificationError("LLM batch job returned a mismatched number of responses")
+
+        return [_inlined_batch_results(index, inlined) for index, inlined in enumerate(responses)]
+
+    def _get_bulk_job(self, job_name: str) -> types.BatchJob:
+        """Poll a batch job, retrying failed calls up to max_retries attempts.
+
+            A failed poll does not stop the job; the error names it so its results
+            can still be fetched once it finishes.
+            """
+
+        for attempt in range(1, self._max_retries + 1):
+            try:
+                return self._client.batches.get(name=job_name)
+            except Exception as exc:
+                if attempt == self._max_retries:
+                    logger.error(
+                        "Polling LLM batch job %s failed: %s; the job keeps running and "
+                        "its results can still be fetched by name",
+                        job_name,
+                        exc,
+                    )
+                    raise LLMClassificationError(f"LLM batch job {job_name} could not be polled") from exc
+
+                sleep_seconds = _RETRY_BACKOFF_SECONDS * (2 ** (attempt - 1))
+                logger.warning(
+                    "Polling LLM batch job %s failed on attempt %d/%d: %s; retrying in %.1f seconds",
+                    job_name,
+                    attempt,
+                    self._max_retries,
+                    exc,
+                    sleep_seconds,
+                )
+                time.sleep(sleep_seconds)
+
+        raise LLMClassificationError(f"LLM batch job {job_name} could not be polled")
+
     def classify_batch(self,requests: Sequence[HelpdeskRequest], catalog: ServiceCatalog) -> dict[
         str, LLMClassificationResult]:
         """Classify a batch of helpdesk requests using the LLM.
@@ -83,73 +303,79 @@ class LLMClassifier:
             return {}
 
         requests_list: list[HelpdeskRequest] = list(requests)
-        catalog_fragment = _catalog_to_prompt_fragment(catalog)
-        requests_block = _build_batch(requests_list)
+        prompt_head, prompt_tail = self.prepare(catalog)
+        prompt = prompt_head + _build_batch(requests_list) + prompt_tail
 
-        prompt = LLM_BATCH_PROMPT_TEMPLATE.format(
-            catalog=catalog_fragment,
-            requests_block=requests_block,
-        )
+        response = self._generate(prompt)
+        text = _get_response_text(response)
 
-        try:
-            response = self._client.models.generate_content(
-                model=self._model,
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    response_mime_type="application/json",
-                    temperature=self._config.temperature,
-                    top_p=self._config.top_p,
-                    top_k=self._config.top_k,
-                ),
-            )
-        except Exception as exc:
-            logger.error("LLM batch classification call failed: %s", exc)
-            raise LLMClassificationError("LLM batch API call failed") from exc
+        return _parse_batch_text(text)
 
-        text = _get_response_text(response)
+def _inlined_batch_results(
+        index: int,
+        inlined: types.InlinedResponse,
+) -> dict[str, LLMClassificationResult] | None:
+    """Parse one inlined response of a batch job; None when that entry failed."""
 
-        try:
-            data: dict[str, Any] = json.loads(text)
-        except json.JSONDecodeError as exc:
-            logger.error("LLM batch returned non-JSON output: %r", text[:300])
-            raise LLMClassificationError("LLM batch output was not valid JSON") from exc
-
-        items = data.get("items")
-        if not isinstance(items, list):
-            logger.error("LLM batch JSON missing 'items' list: %r", data)
-            raise LLMClassificationError("LLM batch JSON missing 'items' list")
-
-        if not items:
-            logger.error("LLM batch JSON contained an empty 'items' list: %r", data)
-            raise LLMClassificationError(
-                "LLM batch JSON contained an empty 'items' list",
-            )
+    if inlined.error is not None or inlined.response is None:
+        logger.error("LLM batch-mode entry %d failed: %s", index, inlined.error)
+        return None
+    try:
+        return _parse_batch_text(_get_response_text(inlined.response))
+    except LLMClassificationError as exc:
+        logger.error("LLM batch-mode entry %d returned unusable output: %s", index, exc)
+        return None
 
-        results: dict[str, LLMClassificationResult] = {}
+def _parse_batch_text(text: str) -> dict[str, LLMClassificationResult]:
+    """Validate the model's JSON output and convert its 'items' into results keyed by id.
 
-        # log if skip malformed items to catch format drift early
-        for index, item in enumerate(items):
-            if not isinstance(item, dict):
-                logger.warning(
-                    "Skipping non-dict item at index %d in LLM batch JSON: %r",
-                    index,
-                    item,
-                )
-                continue
+        Raises LLMClassificationError on invalid JSON, missing or empty 'items',
+        or when all items are rejected as malformed.
+        """
 
-            id_raw = item.get("id")
-            id = normalize_str_or_none(id_raw)
-            if not id:
-                logger.warning(
-                    "Skipping LLM item without valid 'id' at index %d: %r",
-                    index,
-                    item,
-                )
-                continue
+    # orjson: C parser; orjson.JSONDecodeError subclasses json.JSONDecodeError
+    try:
+        data: Any = orjson.loads(text)
+    except orjson.JSONDecodeError as exc:
+        logger.error("LLM batch returned non-JSON output: %r", text[:300])
+        raise LLMClassificationError("LLM batch output was not valid JSON") from exc
+
+    # keep only the 'items' list alive; the wrapper object is dropped right away
+    items = data.get("items") if isinstance(data, dict) else None
+    del data
+    if not isinstance(items, list):
+        logger.error("LLM batch JSON missing 'items' list: %r", text[:300])
+        raise LLMClassificationError("LLM batch JSON missing 'items' list")
+
+    if not items:
+        logger.error("LLM batch JSON contained an empty 'items' list: %r", text[:300])
+        raise LLMClassificationError(
+            "LLM batch JSON contained an empty 'items' list",
+        )
 
-            # warn if model returned SLA fields (must be ignored; SLA comes from Service Catalog)
-            raw_sla_unit = item.get("sla_unit")
-            raw_sla_value = item.get("sla_value")
+    results: dict[str, LLMClassificationResult] = {}
+    normalize = normalize_str_or_none
+
+    # malformed items are skipped and summarized in one warning after the loop,
+    # so format drift is still visible without a log line (and repr) per item
+    skipped: list[tuple[int, Any]] = []
+    for index, item in enumerate(items):
+        # orjson only produces plain dicts
+        if type(item) is not dict:
+            skipped.append((index, item))
+            continue
+
+        get = item.get
+        id = normalize(get("id"))
+        if not id:
+            skipped.append((index, item))
+            continue
+
+        # warn if model returned SLA fields (must be ignored; SLA comes from Service Catalog);
+        # membership test first so well-formed items skip both lookups
+        if "sla_unit" in item or "sla_value" in item:
+            raw_sla_unit = get("sla_unit")
+            raw_sla_value = get("sla_value")
             if raw_sla_unit is not None or raw_sla_value is not None:
                 logger.warning(
                     "LLM returned SLA fields for request %s at index %d (sla_unit=%r, sla_value=%r). "
@@ -160,62 +386,60 @@ class LLMClassifier:
                     raw_sla_value,
                 )
 
-            result = LLMClassificationResult(
-                request_category=normalize_str_or_none(item.get("request_category")),
-                request_type=normalize_str_or_none(item.get("request_type")),
-            )
-            results[id] = result
+        results[id] = LLMClassificationResult(
+            request_category=normalize(get("request_category")),
+            request_type=normalize(get("request_type")),
+        )
 
-        # if all items were rejected, treat it as a format error
-        if not results:
-            logger.error(
-                "LLM batch JSON contained %d item(s) but no valid results after "
-                "validation. Data: %r",
-                len(items),
-                items,
-            )
-            raise LLMClassificationError(
-                "LLM batch JSON contained no valid items (all missing or invalid 'id')",
-            )
+    if skipped:
+        logger.warning(
+            "Skipped %d malformed LLM item(s) (non-dict or without valid 'id'); "
+            "first %d as (index, item): %r",
+            len(skipped),
+            min(len(skipped), _SKIPPED_ITEMS_TO_LOG),
+            skipped[:_SKIPPED_ITEMS_TO_LOG],
+        )
 
-        logger.debug("LLM batch classification produced %d items", len(results))
+    # if all items were rejected, treat it as a format error
+    if not results:
+        logger.error(
+            "LLM batch JSON contained %d item(s) but no valid results after "
+            "validation. Data: %r",
+            len(items),
+            items,
+        )
+        raise LLMClassificationError(
+            "LLM batch JSON contained no valid items (all missing or invalid 'id')",
+        )
 
-        if self._delay_between_batches > 0:
-            logger.debug(
-                "Sleeping %.2f seconds between LLM batches",
-                self._delay_between_batches,
-            )
-            time.sleep(self._delay_between_batches)
+    logger.debug("LLM batch classification produced %d items", len(results))
 
-        return results
+    return results
 
 def _catalog_to_prompt_fragment(catalog: ServiceCatalog) -> str:
     """Render the Service Catalog into a simple text fragment for the prompt."""
 
-    lines: list[str] = []
-    for category in catalog.categories:
-        for req_type in category.requests:
-            sla = req_type.sla
-            lines.append(
-                f"- Category: {category.name} | "
-                f"Request Type: {req_type.name} | "
-                f"SLA: {sla.value} {sla.unit}"
-            )
-    return "\n".join(lines)
+    return "\n".join([
+        f"- Category: {category.name} | "
+        f"Request Type: {req_type.name} | "
+        f"SLA: {req_type.sla.value} {req_type.sla.unit}"
+        for category in catalog.categories
+        for req_type in category.requests
+    ])
 
 def _build_batch(requests: list[HelpdeskRequest]) -> str:
     """Build the text block describing all requests for the LLM prompt."""
 
-    parts: list[str] = []
-    for req in requests:
-        parts.append(
-            f"ID: {req.id or ''}\n"
-            f"Short description: {req.short_description or ''}\n"
-            f"Long description: {req.long_description or ''}\n"
-            f"Current request_category: {req.request_category or ''}\n"
-            f"Current request_type: {req.request_type or ''}\n"
-        )
-    return "\n\n---\n\n".join(parts)
+    # each f-string compiles to a single BUILD_STRING (one allocation per request);
+    # the comprehension feeds join directly, no per-item append calls
+    return _REQUEST_SEPARATOR.join([
+        f"ID: {req.id or ''}\n"
+        f"Short description: {req.short_description or ''}\n"
+        f"Long description: {req.long_description or ''}\n"
+        f"Current request_category: {req.request_category or ''}\n"
+        f"Current request_type: {req.request_type or ''}\n"
+        for req in requests
+    ])
 
 def _get_response_text(response: Any) -> str:
     """Extract non-empty text from the LLM response or raise an error."""
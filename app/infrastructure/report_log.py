@@ -1,16 +1,20 @@
 from __future__ import annotations
 import sqlite3
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class ReportLogRecord:
     filename: str
     created_at: datetime
 
+_BUSY_TIMEOUT_SECONDS = 5.0
+# SQLITE_MAX_VARIABLE_NUMBER default for SQLite < 3.32
+_MAX_SQL_PARAMS = 999
+
 class ReportLogError(RuntimeError):
     """Raised when the report log cannot be accessed."""
 
@@ -22,14 +26,27 @@ class SQLiteReportLog:
         self._db_path = db_path
         self._ensure_schema()
 
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with per-connection PRAGMAs applied."""
+
+        # timeout= sets SQLite's busy timeout (wait on locks instead of failing)
+        conn = sqlite3.connect(self._db_path, timeout=_BUSY_TIMEOUT_SECONDS)
+        # safe with WAL: only the last commits may be lost on power failure, never corrupted
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
     def _ensure_schema(self) -> None:
         """Ensure the SQLite database and 'reports' table exist."""
 
         self._db_path.parent.mkdir(parents=True, exist_ok=True)
 
         try:
-            conn = sqlite3.connect(self._db_path)
+            conn = self._connect()
             try:
+                # WAL is persistent in the database file, so setting it once here is enough;
+                # readers no longer block on (and are not blocked by) the writer
+                conn.execute("PRAGMA journal_mode=WAL")
                 conn.execute(
                     """
                     CREATE TABLE IF NOT EXISTS reports (
@@ -44,13 +61,13 @@ class SQLiteReportLog:
         except sqlite3.Error as exc:
             raise ReportLogError("Failed to initialize report log database") from exc
 
-    def get_record(self, path: Path) -> Optional[ReportLogRecord]:
+    def get_record(self, path: Path) -> ReportLogRecord | None:
         """Return the stored log record for the given path, or None if missing."""
 
         filename = path.name
 
         try:
-            conn = sqlite3.connect(self._db_path)
+            conn = self._connect()
             try:
                 cur = conn.execute(
                     "SELECT created_at FROM reports WHERE filename = ?",
@@ -70,28 +87,80 @@ class SQLiteReportLog:
 
         return ReportLogRecord(filename=filename, created_at=created_at)
 
-    def mark_sent(self, path: Path, created_at: Optional[datetime] = None) -> None:
+    def get_records(self, paths: Sequence[Path]) -> dict[Path, ReportLogRecord]:
+        """Return stored log records for all given paths in one query.
+
+            Paths without a record are absent from the returned mapping.
+            """
+
+        paths_by_filename: dict[str, list[Path]] = {}
+        for path in paths:
+            paths_by_filename.setdefault(path.name, []).append(path)
+        if not paths_by_filename:
+            return {}
+
+        filenames = list(paths_by_filename)
+        rows: list[tuple[str, str]] = []
+
+        try:
+            conn = self._connect()
+            try:
+                # chunk to stay under SQLite's bound-parameter limit
+                for start in range(0, len(filenames), _MAX_SQL_PARAMS):
+                    chunk = filenames[start:start + _MAX_SQL_PARAMS]
+                    placeholders = ",".join("?" * len(chunk))
+                    cur = conn.execute(
+                        f"SELECT filename, created_at FROM reports WHERE filename IN ({placeholders})",
+                        chunk,
+                    )
+                    rows.extend(cur.fetchall())
+            finally:
+                conn.close()
+        except sqlite3.Error as exc:
+            raise ReportLogError("Failed to read from report log database") from exc
+
+        records: dict[Path, ReportLogRecord] = {}
+        for filename, created_at_str in rows:
+            record = ReportLogRecord(
+                filename=filename,
+                created_at=datetime.fromisoformat(created_at_str),
+            )
+            for path in paths_by_filename[filename]:
+                records[path] = record
+        return records
+
+    def mark_sent(self, path: Path, created_at: datetime | None = None) -> None:
         """Mark the given report file as sent at the current time.
             If a record already exists for this filename, it is replaced.
             """
 
+        self.mark_sent_many([path], created_at=created_at)
+
+    def mark_sent_many(self, paths: Iterable[Path], created_at: datetime | None = None) -> None:
+        """Mark several report files as sent in a single transaction (one commit).
+            Existing records for the same filenames are replaced.
+            """
+
         if created_at is None:
             created_at = datetime.now()
 
-        filename = path.name
+        created_at_str = created_at.isoformat(timespec="seconds")
+        rows = [(path.name, created_at_str) for path in paths]
+        if not rows:
+            return
 
         try:
-            conn = sqlite3.connect(self._db_path)
+            conn = self._connect()
             try:
-                conn.execute(
+                conn.executemany(
                     """
                     INSERT OR REPLACE INTO reports (filename, created_at)
                     VALUES (?, ?)
                     """,
-                    (filename, created_at.isoformat(timespec="seconds")),
+                    rows,
                 )
                 conn.commit()
             finally:
                 conn.close()
         except sqlite3.Error as exc:
-            raise ReportLogError("Failed to write to report log database") from exc
\ No newline at end of file
+            raise ReportLogError("Failed to write to report log database") from exc
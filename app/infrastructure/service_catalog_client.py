@@ -1,6 +1,9 @@
 from __future__ import annotations
 import logging
+import os
+from pathlib import Path
 from typing import Any, List
+import orjson
 import requests
 from requests import HTTPError, RequestException
 from app.config import ServiceCatalogConfig
@@ -11,6 +14,9 @@ from app.shared.errors import ServiceCatalogLoadError
 
 logger = logging.getLogger(__name__)
 
+# bump when the on-disk cache layout changes; other versions are ignored
+_DISK_CACHE_VERSION = 1
+
 class ServiceCatalogError(RuntimeError):
     """Raised when the Service Catalog cannot be retrieved, parsed, or validated."""
 
@@ -25,69 +31,142 @@ class ServiceCatalogClient:
         config: ServiceCatalogConfig,
         max_retries: int = 3,
         backoff_factor: float = 0.5,
+        cache_ttl_seconds: float = 3600.0,
+        session: requests.Session | None = None,
     ) -> None:
         self._config = config
-        self._session = requests.Session()
+        self._session = session if session is not None else requests.Session()
         self._max_retries = max_retries
         self._backoff_factor = backoff_factor
+        # the catalog changes rarely; reuse a parsed copy for cache_ttl_seconds (0 disables)
+        self._cache_ttl_seconds = cache_ttl_seconds
+        self._cached_catalog: tuple[float, ServiceCatalog] | None = None
+        # conditional-GET headers and the catalog they validate; seeded from cache_path
+        self._cache_path = Path(config.cache_path) if config.cache_path else None
+        self._validated: tuple[dict[str, str], ServiceCatalog] | None = None
+        self._disk_cache_checked = False
 
     def fetch_catalog(self) -> ServiceCatalog:
+        """Return the Service Catalog, downloading it only when the cached copy expired.
+            Raises ServiceCatalogLoadError when a download is needed and fails.
+            """
+
+        cached = self._cached_catalog
+        now = time.monotonic()
+        if cached is not None and now - cached[0] < self._cache_ttl_seconds:
+            logger.debug("Using cached Service Catalog (age %.1fs)", now - cached[0])
+            return cached[1]
+
+        catalog = self._download_catalog()
+        if self._cache_ttl_seconds > 0:
+            self._cached_catalog = (now, catalog)
+        return catalog
+
+    def _download_catalog(self) -> ServiceCatalog:
         """Download and parse the Service Catalog into domain models.
             Raises ServiceCatalogError on HTTP failures, YAML parse errors, or when
             the YAML structure does not match the expected schema.
             """
 
         try:
-            text = self._download_text()
-            data = self._parse_yaml(text)
+            validated = self._get_validated()
+            text, validators = self._download_text(validated[0] if validated else None)
+            if text is None:
+                if validated is None:
+                    raise ServiceCatalogError("Service Catalog returned 304 without a cached copy")
+                logger.info("[part 2] Service Catalog not modified; reusing cached copy")
+                return validated[1]
 
-            try:
-                categories_raw = data["service_catalog"]["catalog"]["categories"]
-            except (TypeError, KeyError) as exc:
-                msg = (
-                    "Unexpected Service Catalog shape; "
-                    "expected 'service_catalog.catalog.categories'"
-                )
-                logger.error("%s: %s", msg, exc)
-                raise ServiceCatalogError(msg) from exc
-
-            try:
-                categories: List[ServiceCategory] = []
-                for cat in categories_raw:
-                    name = cat["name"]
-                    requests_raw = cat["requests"]
-
-                    requests = [
-                        ServiceRequestType(
-                            name=req["name"],
-                            sla=SLA(
-                                unit=req["sla"]["unit"],
-                                value=int(req["sla"]["value"]),
-                            ),
-                        )
-                        for req in requests_raw
-                    ]
-
-                    categories.append(ServiceCategory(name=name, requests=requests))
-            except (KeyError, TypeError, ValueError) as exc:
-                msg = "Failed to map Service Catalog to domain models"
-                logger.error("%s: %s", msg, exc)
-                raise ServiceCatalogError(msg) from exc
-
-            catalog = ServiceCatalog(categories=categories)
+            catalog = self._build_catalog(text)
             logger.info(
                 "[part 2] Loaded Service Catalog: %d categories, %d total request types",
                 len(catalog.categories),
                 sum(len(c.requests) for c in catalog.categories),
             )
+            self._remember(validators, text, catalog)
             return catalog
         except ServiceCatalogError as exc:
             raise ServiceCatalogLoadError(str(exc)) from exc
         except (RequestException, HTTPError, ValueError, TypeError, KeyError) as exc:
             raise ServiceCatalogLoadError("Failed to load Service Catalog") from exc
 
-    def _download_text(self) -> str:
-        """Download the raw YAML text for the Service Catalog."""
+    def _build_catalog(self, text: str) -> ServiceCatalog:
+        """Parse Service Catalog YAML text and map it into domain models.
+            Raises ServiceCatalogError on YAML errors or an unexpected structure.
+            """
+
+        data = self._parse_yaml(text)
+
+        try:
+            categories_raw = data["service_catalog"]["catalog"]["categories"]
+        except (TypeError, KeyError) as exc:
+            msg = (
+                "Unexpected Service Catalog shape; "
+                "expected 'service_catalog.catalog.categories'"
+            )
+            logger.error("%s: %s", msg, exc)
+            raise ServiceCatalogError(msg) from exc
+
+        try:
+            categories: List[ServiceCategory] = []
+            for cat in categories_raw:
+                name = cat["name"]
+                requests_raw = cat["requests"]
+
+                requests = [
+                    ServiceRequestType(
+                        name=req["name"],
+                        sla=SLA(
+                            unit=req["sla"]["unit"],
+                            value=int(req["sla"]["value"]),
+                        ),
+                    )
+                    for req in requests_raw
+                ]
+
+                categories.append(ServiceCategory(name=name, requests=requests))
+        except (KeyError, TypeError, ValueError) as exc:
+            msg = "Failed to map Service Catalog to domain models"
+            logger.error("%s: %s", msg, exc)
+            raise ServiceCatalogError(msg) from exc
+
+        return ServiceCatalog(categories=categories)
+
+    def _get_validated(self) -> tuple[dict[str, str], ServiceCatalog] | None:
+        """Return the last validated catalog, reading the disk cache on first use.
+            The cached YAML goes through the normal parse path, so a cache that no
+            longer maps onto the current domain models is dropped, not reused.
+            """
+
+        if self._validated is None and self._cache_path is not None and not self._disk_cache_checked:
+            self._disk_cache_checked = True
+            cached = _read_disk_cache(self._cache_path)
+            if cached is not None:
+                validators, text = cached
+                try:
+                    self._validated = (validators, self._build_catalog(text))
+                except ServiceCatalogError as exc:
+                    logger.warning("Ignoring Service Catalog cache %s: %s", self._cache_path, exc)
+        return self._validated
+
+    def _remember(self, validators: dict[str, str], text: str, catalog: ServiceCatalog) -> None:
+        """Keep the catalog for revalidation when the server sent ETag/Last-Modified."""
+
+        if not validators:
+            self._validated = None
+            return
+        self._validated = (validators, catalog)
+        if self._cache_path is not None:
+            _write_disk_cache(self._cache_path, validators, text)
+
+    def _download_text(
+        self,
+        validators: dict[str, str] | None = None,
+    ) -> tuple[str | None, dict[str, str]]:
+        """Download the raw YAML text for the Service Catalog.
+            Sends ``validators`` as conditional headers; returns ``(None, validators)``
+            on 304 Not Modified, otherwise the text and the response's validators.
+            """
 
         # retry GET with exponential backoff on HTTP/network errors
         response: requests.Response | None = None
@@ -97,6 +176,7 @@ class ServiceCatalogClient:
             try:
                 response = self._session.get(
                     self._config.url,
+                    headers=validators,
                     timeout=self._config.timeout_seconds,
                 )
                 response.raise_for_status()
@@ -129,9 +209,12 @@ class ServiceCatalogClient:
                 raise ServiceCatalogError(msg) from last_exc
             raise ServiceCatalogError(msg)
 
+        if response.status_code == 304 and validators:
+            return None, validators
+
         text = response.text
         logger.debug("Raw Service Catalog response length=%d", len(text))
-        return text
+        return text, _response_validators(response)
 
     def _parse_yaml(self, text: str) -> Any:
         """Parse the given YAML text into a Python structure"""
@@ -143,9 +226,58 @@ class ServiceCatalogClient:
             logger.error(msg)
             raise ServiceCatalogError(msg) from exc
 
+        # LibYAML's C loader when PyYAML was built with it; same safe tag set
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
         try:
-            return yaml.safe_load(text)
+            return yaml.load(text, Loader=loader)
         except yaml.YAMLError as exc:
             msg = "Failed to parse Service Catalog YAML"
             logger.error(msg)
-            raise ServiceCatalogError(msg) from exc
\ No newline at end of file
+            raise ServiceCatalogError(msg) from exc
+
+def _response_validators(response: requests.Response) -> dict[str, str]:
+    """Map ETag/Last-Modified of a response to the matching conditional request headers."""
+
+    validators: dict[str, str] = {}
+    etag = response.headers.get("ETag")
+    if isinstance(etag, str):
+        validators["If-None-Match"] = etag
+    last_modified = response.headers.get("Last-Modified")
+    if isinstance(last_modified, str):
+        validators["If-Modified-Since"] = last_modified
+    return validators
+
+def _read_disk_cache(path: Path) -> tuple[dict[str, str], str] | None:
+    """Load ``(validators, yaml_text)`` written by ``_write_disk_cache``; None if unusable."""
+
+    try:
+        cached = orjson.loads(path.read_bytes())
+    except FileNotFoundError:
+        return None
+    except (OSError, orjson.JSONDecodeError) as exc:
+        logger.warning("Ignoring unreadable Service Catalog cache %s: %s", path, exc)
+        return None
+
+    match cached:
+        case {"version": version, "validators": dict() as validators, "yaml": str() as text} if (
+            version == _DISK_CACHE_VERSION
+            and validators
+            and all(isinstance(v, str) for v in validators.values())
+        ):
+            logger.debug("Loaded Service Catalog cache from %s", path)
+            return validators, text
+        case _:
+            logger.warning("Ignoring Service Catalog cache %s with unexpected content or version", path)
+            return None
+
+def _write_disk_cache(path: Path, validators: dict[str, str], text: str) -> None:
+    """Write the validators and raw YAML to ``path`` atomically; failures are only logged."""
+
+    payload = {"version": _DISK_CACHE_VERSION, "validators": validators, "yaml": text}
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_bytes(orjson.dumps(payload))
+        os.replace(tmp_path, path)
+    except OSError as exc:
+        logger.warning("Could not write Service Catalog cache %s: %s", path, exc)
@@ -2,19 +2,28 @@ from __future__ import annotations
 from typing import Any, Optional
 
 
+# ASCII unit separator; joins (category, type) into one str dict key
+# (cached str hash, no tuple allocation per probe)
+PAIR_KEY_SEP = "\x1f"
+
 def normalize_str_or_none(value: Any) -> Optional[str]:
     if value is None:
         return None
-    s = str(value).strip()
+    # JSON and API payloads almost always give a str: skip the str() call
+    s = value.strip() if type(value) is str else str(value).strip()
     return s or None
 
 def normalize_int_or_none(value: Any, *, allow_zero: bool = False) -> Optional[int]:
     if value is None:
         return None
-    try:
-        v_int = int(value)
-    except (TypeError, ValueError):
-        return None
+    # JSON ints need no conversion; bool (an int subclass) still goes through int()
+    if type(value) is int:
+        v_int = value
+    else:
+        try:
+            v_int = int(value)
+        except (TypeError, ValueError):
+            return None
 
     if not allow_zero and v_int <= 0:
         return None
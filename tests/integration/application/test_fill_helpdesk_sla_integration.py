@@ -2,6 +2,7 @@ from __future__ import annotations
 from collections.abc import Sequence
 from dataclasses import dataclass
 from typing import Mapping
+import pytest
 from app.application.classify_helpdesk_requests import classify_requests
 from app.application.llm_classifier import LLMClassificationError, LLMClassificationResult
 from app.application.fill_helpdesk_sla import fill_helpdesk_sla
@@ -62,13 +63,11 @@ class FakeClassifier:
             if r.id in self._results_by_id
         }
 
-def test_flow_classify_then_derive_sla_happy_path() -> None:
+def test_flow_classify_then_derive_sla_happy_path(catalog: ServiceCatalog) -> None:
     req1 = _make_request("r1")
     req2 = _make_request("r2")
     requests = [req1, req2]
 
-    catalog = _make_catalog()
-
     llm_results = {
         "r1": LLMClassificationResult(
             request_category="Access",
@@ -105,14 +104,12 @@ def test_flow_classify_then_derive_sla_happy_path() -> None:
 
     assert classifier.calls == 1
 
-def test_flow_batch_failure_does_not_derive_sla_for_failed_batch() -> None:
+def test_flow_batch_failure_does_not_derive_sla_for_failed_batch(catalog: ServiceCatalog) -> None:
     req1 = _make_request("r1")
     req2 = _make_request("r2")
     req3 = _make_request("r3")
     requests = [req1, req2, req3]
 
-    catalog = _make_catalog()
-
     llm_results = {
         "r1": LLMClassificationResult(
             request_category="Cat1",
@@ -157,7 +154,9 @@ def test_flow_batch_failure_does_not_derive_sla_for_failed_batch() -> None:
     assert req3.sla_unit is None
     assert req3.sla_value is None
 
-def _make_catalog() -> ServiceCatalog:
+# frozen and never mutated by the flow (only requests are), so one instance serves the module
+@pytest.fixture(scope="module")
+def catalog() -> ServiceCatalog:
     return ServiceCatalog(
         categories=[
             ServiceCategory(
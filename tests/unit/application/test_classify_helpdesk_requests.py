@@ -1,6 +1,7 @@
 from __future__ import annotations
 from typing import Mapping
-from app.application.classify_helpdesk_requests import classify_requests
+import pytest
+from app.application.classify_helpdesk_requests import classify_requests, iter_classified_requests
 from app.application.llm_classifier import LLMClassificationResult, LLMClassificationError
 from app.domain.helpdesk import HelpdeskRequest
 from app.domain.service_catalog import ServiceCatalog, ServiceCategory, ServiceRequestType, SLA
@@ -91,16 +92,16 @@ def test_classify_requests_with_llm_happy_path() -> None:
     # same number of items and same order
     assert [r.id for r in classified] == ["r1", "r2"]
 
-    # fields updated from LLM result
+    # fields updated from LLM result, SLA filled from the resolved catalog entry
     assert req1.request_category == "Access"
     assert req1.request_type == "Password reset"
-    assert req1.sla_unit is None
-    assert req1.sla_value is None
+    assert req1.sla_unit == "hours"
+    assert req1.sla_value == 4
 
     assert req2.request_category == "Hardware"
     assert req2.request_type == "Laptop issue"
-    assert req2.sla_unit is None
-    assert req2.sla_value is None
+    assert req2.sla_unit == "hours"
+    assert req2.sla_value == 24
 
     # classifier was called once
     assert classifier.calls == 1
@@ -196,4 +197,230 @@ def test_classify_requests_applies_canonical_strings_case_insensitive() -> None:
     )
 
     assert req1.request_category == "Access"
-    assert req1.request_type == "Password reset"
\ No newline at end of file
+    assert req1.request_type == "Password reset"
+
+# concurrent batches still return requests in input order
+def test_classify_requests_concurrent_batches_keep_input_order() -> None:
+    requests = [_make_request(f"r{i}") for i in range(7)]
+
+    service_catalog = ServiceCatalog(
+        categories=[
+            ServiceCategory(
+                name="Access",
+                requests=[ServiceRequestType(name="Password reset", sla=SLA(unit="hours", value=4))],
+            ),
+        ]
+    )
+
+    classifier = FakeClassifier(
+        results_by_id={
+            r.id: LLMClassificationResult(request_category="Access", request_type="Password reset")
+            for r in requests
+            if r.id is not None
+        }
+    )
+
+    classified = classify_requests(
+        classifier=classifier,
+        service_catalog=service_catalog,
+        requests_=requests,
+        batch_size=2,
+        concurrency=3,
+    )
+
+    assert [r.id for r in classified] == [f"r{i}" for i in range(7)]
+    assert all(r.request_category == "Access" for r in classified)
+    assert classifier.calls == 4
+
+# with concurrent batches, a failing batch leaves only its own requests unclassified
+def test_classify_requests_concurrent_batch_failure_is_isolated() -> None:
+    requests = [_make_request(f"r{i}") for i in range(7)]
+
+    class FailOnR2Classifier(FakeClassifier):
+        def classify_batch(
+            self,
+            requests: Sequence[HelpdeskRequest],
+            service_catalog: ServiceCatalog,
+        ) -> Mapping[str, LLMClassificationResult]:
+            if any(r.id == "r2" for r in requests):
+                raise LLMClassificationError("boom")
+            return super().classify_batch(requests, service_catalog)
+
+    service_catalog = ServiceCatalog(
+        categories=[
+            ServiceCategory(
+                name="Access",
+                requests=[ServiceRequestType(name="Password reset", sla=SLA(unit="hours", value=4))],
+            ),
+        ]
+    )
+    classifier = FailOnR2Classifier(
+        results_by_id={
+            r.id: LLMClassificationResult(request_category="Access", request_type="Password reset")
+            for r in requests
+            if r.id is not None
+        }
+    )
+
+    classified = classify_requests(
+        classifier=classifier,
+        service_catalog=service_catalog,
+        requests_=requests,
+        batch_size=2,
+        concurrency=4,
+    )
+
+    assert [r.id for r in classified if r.request_category is None] == ["r2", "r3"]
+    assert [r.id for r in classified if r.request_category == "Access"] == ["r0", "r1", "r4", "r5", "r6"]
+
+# batch_mode sends every batch in one classify_bulk call; a failed entry leaves only its batch unclassified
+def test_classify_requests_batch_mode_uses_one_bulk_call() -> None:
+    requests = [_make_request(f"r{i}") for i in range(5)]
+    result = LLMClassificationResult(request_category="Access", request_type="Password reset")
+
+    class FakeBulkClassifier(FakeClassifier):
+        def __init__(self) -> None:
+            super().__init__(results_by_id={})
+            self.bulk_batches: list[list[str | None]] = []
+
+        def classify_bulk(
+            self,
+            batches: Sequence[Sequence[HelpdeskRequest]],
+            service_catalog: ServiceCatalog,
+        ) -> Sequence[Mapping[str, LLMClassificationResult] | None]:
+            self.bulk_batches = [[r.id for r in batch] for batch in batches]
+            return [{r.id or "": result for r in batch} if index != 1 else None for index, batch in enumerate(batches)]
+
+    service_catalog = ServiceCatalog(
+        categories=[
+            ServiceCategory(
+                name="Access",
+                requests=[ServiceRequestType(name="Password reset", sla=SLA(unit="hours", value=4))],
+            ),
+        ]
+    )
+    classifier = FakeBulkClassifier()
+
+    classified = classify_requests(
+        classifier=classifier,
+        service_catalog=service_catalog,
+        requests_=requests,
+        batch_size=2,
+        batch_mode=True,
+    )
+
+    assert classifier.calls == 0
+    assert classifier.bulk_batches == [["r0", "r1"], ["r2", "r3"], ["r4"]]
+    assert [r.id for r in classified if r.request_category == "Access"] == ["r0", "r1", "r4"]
+    assert classified[0].sla_value == 4
+
+# a short classify_bulk result keeps the trailing batches in the output, unclassified
+def test_classify_requests_batch_mode_keeps_batches_missing_from_bulk_result() -> None:
+    requests = [_make_request(f"r{i}") for i in range(5)]
+    result = LLMClassificationResult(request_category="Access", request_type="Password reset")
+
+    class ShortBulkClassifier(FakeClassifier):
+        def classify_bulk(
+            self,
+            batches: Sequence[Sequence[HelpdeskRequest]],
+            service_catalog: ServiceCatalog,
+        ) -> Sequence[Mapping[str, LLMClassificationResult] | None]:
+            return [{r.id or "": result for r in batches[0]}]
+
+    service_catalog = ServiceCatalog(
+        categories=[
+            ServiceCategory(
+                name="Access",
+                requests=[ServiceRequestType(name="Password reset", sla=SLA(unit="hours", value=4))],
+            ),
+        ]
+    )
+
+    classified = classify_requests(
+        classifier=ShortBulkClassifier(results_by_id={}),
+        service_catalog=service_catalog,
+        requests_=requests,
+        batch_size=2,
+        batch_mode=True,
+    )
+
+    assert [r.id for r in classified] == ["r0", "r1", "r2", "r3", "r4"]
+    assert [r.id for r in classified if r.request_category == "Access"] == ["r0", "r1"]
+
+# batches are yielded as soon as they are applied, before later LLM calls
+def test_iter_classified_requests_yields_batch_before_next_call() -> None:
+    requests = [_make_request("r1"), _make_request("r2"), _make_request("r3")]
+    classifier = FakeClassifier(results_by_id={})
+
+    stream = iter_classified_requests(
+        classifier=classifier,
+        service_catalog=ServiceCatalog(categories=[]),
+        requests_=requests,
+        batch_size=2,
+    )
+
+    assert [next(stream).id, next(stream).id] == ["r1", "r2"]
+    assert classifier.calls == 1
+    assert [r.id for r in stream] == ["r3"]
+    assert classifier.calls == 2
+
+# concurrent batches are dispatched through a window: at most `concurrency` in flight,
+# progress logged at real dispatch, and closing the stream early skips batches not yet sent
+def test_iter_classified_requests_bounds_in_flight_batches(caplog: pytest.LogCaptureFixture) -> None:
+    caplog.set_level("INFO")
+    requests = [_make_request(f"r{i}") for i in range(6)]
+    classifier = FakeClassifier(results_by_id={})
+
+    stream = iter_classified_requests(
+        classifier=classifier,
+        service_catalog=ServiceCatalog(categories=[]),
+        requests_=requests,
+        batch_size=1,
+        concurrency=2,
+    )
+
+    assert next(stream).id == "r0"
+    stream.close()
+
+    sent = [r for r in caplog.records if "Sending batch" in r.getMessage()]
+    assert len(sent) == 3
+    assert classifier.calls <= 3
+
+# batches group requests by (category, type); the returned list keeps input order
+def test_classify_requests_groups_batches_by_category_and_type() -> None:
+    requests = [
+        HelpdeskRequest(id="r1", short_description="a", request_category="Hardware", request_type="Laptop issue"),
+        HelpdeskRequest(id="r2", short_description="a", request_category="Access", request_type="Password reset"),
+        HelpdeskRequest(id="r3", short_description="a", request_category="Hardware", request_type="Laptop issue"),
+        HelpdeskRequest(id="r4", short_description="a", request_category="Access", request_type="Password reset"),
+    ]
+    classifier = FakeClassifier(results_by_id={})
+
+    classified = classify_requests(
+        classifier=classifier,
+        service_catalog=ServiceCatalog(categories=[]),
+        requests_=requests,
+        batch_size=2,
+    )
+
+    assert [[r.id for r in batch] for batch in classifier.batches] == [["r2", "r4"], ["r1", "r3"]]
+    assert [r.id for r in classified] == ["r1", "r2", "r3", "r4"]
+
+# with an empty catalog LLM results are rejected and requests pass through unchanged
+def test_classify_requests_empty_catalog_rejects_results() -> None:
+    req1 = _make_request("r1")
+    classifier = FakeClassifier(
+        results_by_id={"r1": LLMClassificationResult(request_category="Access", request_type="Password reset")},
+    )
+
+    classified = classify_requests(
+        classifier=classifier,
+        service_catalog=ServiceCatalog(categories=[]),
+        requests_=[req1],
+        batch_size=10,
+    )
+
+    assert classified == [req1]
+    assert req1.request_category is None
+    assert req1.request_type is None
+    assert req1.sla_unit is None
@@ -0,0 +1,26 @@
+from __future__ import annotations
+from app.application.classify_helpdesk_requests_progress import _batch_bounds
+from app.domain.helpdesk import HelpdeskRequest
+
+
+# construct a request whose text is roughly `chars` characters long
+def _make_request(id: str, chars: int = 0) -> HelpdeskRequest:
+    return HelpdeskRequest(id=id, short_description="x" * chars)
+
+# without a token budget batches are fixed-size slices
+def test_batch_bounds_fixed_size() -> None:
+    requests = [_make_request(str(i)) for i in range(5)]
+
+    assert _batch_bounds(requests, batch_size=2) == [(0, 2), (2, 4), (4, 5)]
+
+# a token budget closes batches early; an oversized request gets its own batch
+def test_batch_bounds_respects_token_budget() -> None:
+    requests = [
+        _make_request("r1", chars=280),
+        _make_request("r2", chars=280),
+        _make_request("r3", chars=2000),
+        _make_request("r4", chars=0),
+    ]
+
+    # r1/r2 are ~100 tokens each, r3 ~530, r4 ~30
+    assert _batch_bounds(requests, batch_size=10, max_batch_tokens=250) == [(0, 2), (2, 3), (3, 4)]
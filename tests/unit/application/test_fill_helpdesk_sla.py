@@ -1,6 +1,8 @@
 from __future__ import annotations
 from dataclasses import dataclass
+import pytest
 from app.application.fill_helpdesk_sla import fill_helpdesk_sla
+from app.shared.normalization import PAIR_KEY_SEP
 
 
 @dataclass
@@ -22,6 +24,11 @@ class DummyCategory:
 class DummyCatalog:
     categories: list[DummyCategory]
 
+    # mirrors ServiceCatalog.sla_index
+    @property
+    def sla_index(self) -> dict[str, DummySLA]:
+        return {c.name + PAIR_KEY_SEP + rt.name: rt.sla for c in self.categories for rt in c.requests}
+
 @dataclass
 class DummyHelpdeskRequest:
     id: str
@@ -212,4 +219,45 @@ def test_fill_helpdesk_sla_fills_only_missing_value() -> None:
     fill_helpdesk_sla([req], catalog)                                                                                                # type: ignore[arg-type]
 
     assert req.sla_unit == "hours"
-    assert req.sla_value == 6
\ No newline at end of file
+    assert req.sla_value == 6
+
+# surrounding whitespace on category/type does not prevent a catalog match
+def test_fill_helpdesk_sla_strips_category_and_type() -> None:
+    catalog = DummyCatalog(
+        categories=[DummyCategory(name="Hardware", requests=[DummyRequestType("Replace mouse", DummySLA("hours", 6))])]
+    )
+    req = DummyHelpdeskRequest(id="req_ws", request_category=" Hardware ", request_type="Replace mouse\n")
+    blank = DummyHelpdeskRequest(id="req_blank", request_category="   ", request_type="Replace mouse")
+
+    fill_helpdesk_sla([req, blank], catalog)                                                                                # type: ignore[list-item, arg-type]
+
+    assert (req.sla_unit, req.sla_value) == ("hours", 6)
+    assert (blank.sla_unit, blank.sla_value) == (None, None)
+
+# requests that already carry a full SLA are never filled, but unknown pairs are still reported
+def test_fill_helpdesk_sla_reports_unknown_pairs_on_fully_populated_requests(caplog: pytest.LogCaptureFixture) -> None:
+    caplog.set_level("INFO")
+    catalog = DummyCatalog(
+        categories=[DummyCategory(name="Hardware", requests=[DummyRequestType("Replace mouse", DummySLA("hours", 6))])]
+    )
+    known = DummyHelpdeskRequest(
+        id="req_known",
+        request_category="Hardware",
+        request_type="Replace mouse",
+        sla_unit="days",
+        sla_value=3,
+    )
+    unknown = DummyHelpdeskRequest(
+        id="req_unknown",
+        request_category="Not in catalog",
+        request_type="Unknown",
+        sla_unit="days",
+        sla_value=3,
+    )
+
+    fill_helpdesk_sla([known, unknown], catalog)                                                                            # type: ignore[list-item, arg-type]
+
+    assert (known.sla_unit, known.sla_value) == ("days", 3)
+    assert (unknown.sla_unit, unknown.sla_value) == ("days", 3)
+    assert "unknown_pairs=1 skipped_already_has_sla=1" in caplog.text
+    assert "could not be derived for 1 request(s)" in caplog.text
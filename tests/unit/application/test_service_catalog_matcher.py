@@ -0,0 +1,67 @@
+from __future__ import annotations
+import pytest
+from app.application.service_catalog_matcher import ServiceCatalogMatcher
+from app.domain.service_catalog import ServiceCatalog, ServiceCategory, ServiceRequestType, SLA
+
+
+def _make_catalog(*pairs: tuple[str, str]) -> ServiceCatalog:
+    return ServiceCatalog(
+        categories=[
+            ServiceCategory(
+                name=category,
+                requests=[ServiceRequestType(name=request_type, sla=SLA(unit="hours", value=4))],
+            )
+            for category, request_type in pairs
+        ]
+    )
+
+# case/whitespace differences resolve to canonical catalog strings
+def test_resolve_returns_canonical_strings() -> None:
+    matcher = ServiceCatalogMatcher(_make_catalog(("Access", "Password reset")))
+
+    match = matcher.resolve("  access ", "PASSWORD   RESET")
+
+    assert match is not None
+    assert match.request_category == "Access"
+    assert match.request_type == "Password reset"
+
+# non-catalog pairs and missing values are rejected
+def test_resolve_rejects_unknown_or_missing_pair() -> None:
+    matcher = ServiceCatalogMatcher(_make_catalog(("Access", "Password reset")))
+
+    assert matcher.resolve("Access", "Laptop issue") is None
+    assert matcher.resolve(None, "Password reset") is None
+    assert matcher.resolve("Access", "") is None
+
+# two catalog entries that normalize to the same key are ambiguous
+def test_resolve_rejects_normalization_collision() -> None:
+    matcher = ServiceCatalogMatcher(
+        _make_catalog(("Access", "Password reset"), ("ACCESS", "Password  Reset")),
+    )
+
+    assert matcher.resolve("Access", "Password reset") is None
+
+# resolve_with_sla returns the catalog SLA of the matched pair
+def test_resolve_with_sla_returns_catalog_sla() -> None:
+    matcher = ServiceCatalogMatcher(_make_catalog(("Access", "Password reset")))
+
+    resolved = matcher.resolve_with_sla("access", "password reset")
+
+    assert resolved is not None
+    match, sla = resolved
+    assert match.request_type == "Password reset"
+    assert (sla.unit, sla.value) == ("hours", 4)
+
+# canonical spellings hit the raw-key fast path without normalizing
+def test_resolve_canonical_pair_skips_normalization(monkeypatch: pytest.MonkeyPatch) -> None:
+    matcher = ServiceCatalogMatcher(_make_catalog(("Access", "Password reset")))
+
+    def _fail(value: str) -> str:
+        raise AssertionError("normalization should not run for canonical pairs")
+
+    monkeypatch.setattr("app.application.service_catalog_matcher._norm", _fail)
+
+    match = matcher.resolve("Access", "Password reset")
+
+    assert match is not None
+    assert match.request_type == "Password reset"
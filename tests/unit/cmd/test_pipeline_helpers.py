@@ -21,9 +21,16 @@ class _FakeReportLog:
             return _FakeRecord(datetime(2025, 12, 10, 10, 0, 0))
         return None
 
+    def get_records(self, paths: list[Path]):
+        records = {path: self.get_record(path) for path in paths}
+        return {path: record for path, record in records.items() if record is not None}
+
     def mark_sent(self, path: Path, created_at: datetime) -> None:
         pass
 
+    def mark_sent_many(self, paths: list[Path], created_at: datetime) -> None:
+        pass
+
 
 def test_collect_unsent_reports_explicit_not_logged(tmp_path):
     project_root = tmp_path
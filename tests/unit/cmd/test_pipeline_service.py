@@ -1,4 +1,5 @@
 from __future__ import annotations
+import threading
 from pathlib import Path
 from typing import Any
 import app.cmd.pipeline_service as ps
@@ -33,9 +34,15 @@ class FakeReportLog:
     def get_record(self, path: Path) -> Any:
         return None
 
+    def get_records(self, paths: Sequence[Path]) -> dict[Path, Any]:
+        return {}
+
     def mark_sent(self, path: Path, created_at: Any) -> None:
         self.marked.append(path)
 
+    def mark_sent_many(self, paths: Sequence[Path], created_at: Any) -> None:
+        self.marked.extend(paths)
+
 class FakeEmailBodyBuilder:
     def build(self, codebase_url: str, candidate_name: str) -> tuple[str, str]:
         text = f"Codebase: {codebase_url}\nName: {candidate_name}\n"
@@ -105,12 +112,17 @@ def test_run_pipeline_happy_path(monkeypatch, tmp_path) -> None:
     def fake_load_service_catalog(_client):
         return "fake_catalog"
 
-    def fake_classify_requests(llm, service_catalog, requests_, batch_size: int):
+    def fake_classify_requests(
+            llm, service_catalog, requests_, batch_size: int, concurrency: int, max_batch_tokens: int, batch_mode: bool,
+    ):
         # echo requests back
         assert llm is fake_llm
         assert service_catalog == "fake_catalog"
         assert [r.id for r in requests_] == ["req1", "req2"]
         assert batch_size == 10
+        assert concurrency == 1
+        assert max_batch_tokens == 0
+        assert batch_mode is False
         return list(requests_)
 
     def fake_fill_helpdesk_sla(requests_, service_catalog):
@@ -202,4 +214,42 @@ def test_run_pipeline_sends_unsent_reports(monkeypatch, tmp_path) -> None:
     assert set(attachments) == {unsent1.resolve(), unsent2.resolve()}
 
     # and both should be marked as sent
-    assert set(fake_log.marked) == {unsent1.resolve(), unsent2.resolve()}
\ No newline at end of file
+    assert set(fake_log.marked) == {unsent1.resolve(), unsent2.resolve()}
+
+# helpdesk requests and the service catalog are fetched concurrently
+def test_fetch_requests_and_catalog_overlaps_fetches(monkeypatch, tmp_path) -> None:
+    catalog_started = threading.Event()
+    catalog = ServiceCatalog(categories=[])
+
+    class BlockingHelpdeskService(FakeHelpdeskService):
+        def load_helpdesk_requests(self) -> list[HelpdeskRequest]:
+            # only returns in time if the catalog fetch runs at the same time
+            self.overlapped = catalog_started.wait(timeout=5)
+            return super().load_helpdesk_requests()
+
+    def fake_load_service_catalog(_client):
+        catalog_started.set()
+        return catalog
+
+    monkeypatch.setattr(ps, "_load_service_catalog", fake_load_service_catalog)
+
+    helpdesk = BlockingHelpdeskService(requests_=[_make_req("req1")])
+    deps = PipelineDeps(
+        project_root=tmp_path,
+        helpdesk_service=helpdesk,
+        service_catalog_client=FakeServiceCatalogClient(),
+        llm_classifier=FakeLLMClassifier(),
+        report_log=FakeReportLog(),
+        batch_size=10,
+        email_body_builder=FakeEmailBodyBuilder(),
+        report_exporter=FakeReportExporter(report_path=tmp_path / "report.xlsx"),
+        email_sender=FakeEmailSender(),
+        codebase_url="https://github.com/Steaxy/automated_ticket_attribution",
+        candidate_name="John Doe",
+    )
+
+    requests_, service_catalog = ps._fetch_requests_and_catalog(deps)
+
+    assert helpdesk.overlapped is True
+    assert [r.id for r in requests_] == ["req1"]
+    assert service_catalog is catalog
@@ -0,0 +1,32 @@
+from __future__ import annotations
+import pickle
+from app.domain.service_catalog import ServiceCatalog, ServiceCategory, ServiceRequestType, SLA
+
+
+def _make_catalog() -> ServiceCatalog:
+    return ServiceCatalog(
+        categories=[
+            ServiceCategory(
+                name="Access",
+                requests=[ServiceRequestType(name="Password reset", sla=SLA(unit="hours", value=4))],
+            ),
+        ]
+    )
+
+# get_sla resolves exact (category, type) names through the prebuilt index
+def test_get_sla_uses_exact_names() -> None:
+    catalog = _make_catalog()
+
+    assert catalog.get_sla("Access", "Password reset") == SLA(unit="hours", value=4)
+    assert catalog.get_sla("access", "Password reset") is None
+    assert catalog.get_sla("Access", "Laptop issue") is None
+
+# the derived index is left out of equality/repr and survives pickling
+def test_sla_index_is_not_compared_and_survives_pickle() -> None:
+    catalog = _make_catalog()
+
+    restored = pickle.loads(pickle.dumps(catalog, protocol=pickle.HIGHEST_PROTOCOL))
+
+    assert restored == catalog
+    assert "sla_index" not in repr(catalog)
+    assert restored.get_sla("Access", "Password reset") == SLA(unit="hours", value=4)
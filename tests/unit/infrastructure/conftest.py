@@ -0,0 +1,31 @@
+from __future__ import annotations
+import pytest
+from app.config import HelpdeskAPIConfig, ServiceCatalogConfig
+
+
+# configs are frozen dataclasses, so one instance is shared by the whole session
+@pytest.fixture(scope="session")
+def helpdesk_config() -> HelpdeskAPIConfig:
+    return HelpdeskAPIConfig(
+        url="https://example.com/helpdesk",
+        api_key="dummy-key",
+        api_secret="dummy-secret",
+        timeout_seconds=5.0,
+    )
+
+@pytest.fixture(scope="session")
+def service_catalog_config() -> ServiceCatalogConfig:
+    return ServiceCatalogConfig(
+        url="https://example.com/service-catalog",
+        timeout_seconds=5.0,
+    )
+
+# PyYAML is imported lazily by _parse_yaml and google.genai by the LLM client module;
+# load both (plus the attributes the code reaches for) once in session setup so the
+# first test touching them does not carry the one-time import cost in its call
+@pytest.fixture(scope="session", autouse=True)
+def _warm_heavy_imports() -> None:
+    import yaml
+    from google import genai
+
+    _ = getattr(yaml, "CSafeLoader", yaml.SafeLoader), genai.types.JobState
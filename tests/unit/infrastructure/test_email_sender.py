@@ -0,0 +1,79 @@
+from __future__ import annotations
+from email.message import EmailMessage
+from pathlib import Path
+from typing import Self
+import pytest
+from app.config import EmailConfig
+from app.infrastructure.email_sender import SMTPSender, _attach_file
+
+
+# memory-mapped attachments round-trip byte-for-byte, empty files included
+def test_attach_file_round_trips_content(tmp_path: Path) -> None:
+    report = tmp_path / "report.xlsx"
+    report.write_bytes(b"report-bytes" * 1000)
+    empty = tmp_path / "empty.xlsx"
+    empty.write_bytes(b"")
+
+    msg = EmailMessage()
+    msg.set_content("body")
+
+    assert _attach_file(msg, report) == 12000
+    assert _attach_file(msg, empty) == 0
+
+    attached = list(msg.iter_attachments())
+    assert [part.get_filename() for part in attached] == ["report.xlsx", "empty.xlsx"]
+    assert attached[0].get_content() == b"report-bytes" * 1000
+    assert attached[1].get_content() == b""
+
+class _FakeSMTP:
+    def __init__(self, host: str, port: int) -> None:
+        self.logins = 0
+        self.sent: list[EmailMessage] = []
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        pass
+
+    def login(self, username: str, password: str) -> None:
+        self.logins += 1
+
+    def send_message(self, msg: EmailMessage) -> None:
+        self.sent.append(msg)
+
+# connections opened through smtplib.SMTP during one test, in order
+@pytest.fixture
+def smtp_connections(monkeypatch: pytest.MonkeyPatch) -> list[_FakeSMTP]:
+    connections: list[_FakeSMTP] = []
+
+    def connect(host: str, port: int) -> _FakeSMTP:
+        connection = _FakeSMTP(host, port)
+        connections.append(connection)
+        return connection
+
+    monkeypatch.setattr("app.infrastructure.email_sender.smtplib.SMTP", connect)
+    return connections
+
+
+# send_many reuses one connection and one login for all messages
+def test_send_many_uses_single_connection(smtp_connections: list[_FakeSMTP]) -> None:
+    sender = SMTPSender(
+        EmailConfig(
+            smtp_host="smtp.example.com",
+            smtp_port=587,
+            use_tls=False,
+            username="user",
+            password="secret",
+            sender="user@example.com",
+            recipient="to@example.com",
+            candidate_name="Candidate",
+        )
+    )
+
+    sent_count = sender.send_many([EmailMessage(), EmailMessage(), EmailMessage()])
+
+    assert sent_count == 3
+    assert len(smtp_connections) == 1
+    assert smtp_connections[0].logins == 1
+    assert len(smtp_connections[0].sent) == 3
@@ -1,33 +1,37 @@
+import json
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from dataclasses import dataclass
 from typing import Any
 from unittest.mock import Mock
 import pytest
 from app.config import HelpdeskAPIConfig
 from app.infrastructure.helpdesk_client import HelpdeskClient, HelpdeskAPIError
 from app.application.dto.fetched_helpdesk_request import FetchedHelpdeskRequest
+import requests
 from requests import HTTPError
+from requests.exceptions import RetryError
 
 
-def _make_client_with_mock_session(json_payload: Any) -> HelpdeskClient:
-    config = HelpdeskAPIConfig(
-        url="https://example.com/helpdesk",
-        api_key="dummy-key",
-        api_secret="dummy-secret",
-        timeout_seconds=5.0,
-    )
+# plain stand-in for requests.Response: only what HelpdeskClient reads
+@dataclass
+class FakeResponse:
+    content: bytes = b""
+    error: Exception | None = None
 
-    client = HelpdeskClient(config)
+    def raise_for_status(self) -> None:
+        if self.error is not None:
+            raise self.error
 
+def _make_client_with_mock_session(config: HelpdeskAPIConfig, json_payload: Any) -> HelpdeskClient:
     mock_session = Mock()
-    mock_response = Mock()
-    mock_response.raise_for_status = Mock()
-    mock_response.json = Mock(return_value=json_payload)
+    mock_session.post = Mock(return_value=FakeResponse(content=json.dumps(json_payload).encode("utf-8")))
 
-    mock_session.post = Mock(return_value=mock_response)
+    return HelpdeskClient(config, session=mock_session)                                                                     # type: ignore[arg-type]
 
-    client._session = mock_session                                                                                          # type: ignore[attr-defined]
-    return client
-
-def test_fetch_requests_happy_path() -> None:
+def test_fetch_requests_happy_path(helpdesk_config: HelpdeskAPIConfig) -> None:
     sample_data: dict[str, Any] = {
         "response_code": 200,
         "data": {
@@ -45,7 +49,7 @@ def test_fetch_requests_happy_path() -> None:
         },
     }
 
-    client = _make_client_with_mock_session(sample_data)
+    client = _make_client_with_mock_session(helpdesk_config, sample_data)
 
     result: list[FetchedHelpdeskRequest] = client.fetch_requests()
 
@@ -55,133 +59,145 @@ def test_fetch_requests_happy_path() -> None:
     assert fetched.request.short_description == "Forgot my Okta password"
     assert fetched.raw_payload["requester_email"] == "j.doe@company.com"
 
-def test_fetch_requests_unexpected_shape_raises() -> None:
-    bad_data = {
-        "response_code": 200,
-        "data": {"not_requests": []},
-    }
-
-    client = _make_client_with_mock_session(bad_data)
-
-    with pytest.raises(HelpdeskAPIError):
-        _ = client.fetch_requests()
-
-def test_fetch_raw_returns_json() -> None:
+def test_fetch_raw_returns_json(helpdesk_config: HelpdeskAPIConfig) -> None:
     sample_data = {"foo": "bar"}
-    client = _make_client_with_mock_session(sample_data)
+    client = _make_client_with_mock_session(helpdesk_config, sample_data)
 
     raw = client.fetch_raw()
     assert raw == sample_data
 
-def test_http_error_is_wrapped_in_helpdesk_api_error() -> None:
-    config = HelpdeskAPIConfig(
-        url="https://example.com/helpdesk",
-        api_key="dummy-key",
-        api_secret="dummy-secret",
-        timeout_seconds=5.0,
-    )
-
-    client = HelpdeskClient(config)
-
-    mock_session = Mock()
-    mock_response = Mock()
-
-    mock_response.raise_for_status.side_effect = HTTPError("404 not found")
-    mock_session.post.return_value = mock_response
-
-    client._session = mock_session                                                                                          # type: ignore[attr-defined]
-
-    with pytest.raises(HelpdeskAPIError):
-        _ = client.fetch_requests()
-
-def test_json_error_is_wrapped_in_helpdesk_api_error() -> None:
-    config = HelpdeskAPIConfig(
-        url="https://example.com/helpdesk",
-        api_key="dummy-key",
-        api_secret="dummy-secret",
-        timeout_seconds=5.0,
-    )
-
-    client = HelpdeskClient(config)
-
+# retries are configured on the session adapter (attempts, backoff, statuses, POST)
+def test_session_adapter_retries_transient_errors(helpdesk_config: HelpdeskAPIConfig) -> None:
+    client = HelpdeskClient(helpdesk_config, max_retries=3, backoff_factor=0.5)
+
+    adapter = client._session.get_adapter(helpdesk_config.url)                                                             # type: ignore[attr-defined]
+    retry = adapter.max_retries
+
+    assert retry.total == 2
+    assert retry.backoff_factor == 0.5
+    assert {429, 500, 502, 503, 504} <= set(retry.status_forcelist)
+    assert "POST" in retry.allowed_methods
+
+@contextmanager
+def _serve_statuses(statuses: list[int]) -> Iterator[tuple[str, list[str]]]:
+    """Serve one status per POST on localhost (200 bodies are an empty request list); yields (url, methods seen)."""
+
+    seen: list[str] = []
+    remaining = list(statuses)
+    body = json.dumps({"data": {"requests": []}}).encode("utf-8")
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:
+            seen.append(self.command)
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            status = remaining.pop(0)
+            payload = body if status == 200 else b"{}"
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            return None
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/requests", seen
+    finally:
+        server.shutdown()
+        server.server_close()
+
+# the real session adapter re-sends POSTs on transient statuses and gives up after max_retries attempts
+@pytest.mark.parametrize(
+    ("statuses", "succeeds", "attempts"),
+    [
+        pytest.param([503, 200], True, 2, id="503-then-200"),
+        pytest.param([500, 502, 200], True, 3, id="recovers-on-last-attempt"),
+        pytest.param([503, 503, 503], False, 3, id="exhausted"),
+        pytest.param([404], False, 1, id="not-retried"),
+    ],
+)
+def test_session_adapter_retries_post_end_to_end(statuses: list[int], succeeds: bool, attempts: int) -> None:
+    with _serve_statuses(statuses) as (url, seen):
+        config = HelpdeskAPIConfig(url=url, api_key="dummy-key", api_secret="dummy-secret", timeout_seconds=5.0)
+        client = HelpdeskClient(config, max_retries=3, backoff_factor=0.0)
+
+        if succeeds:
+            assert client.fetch_requests() == []
+        else:
+            with pytest.raises(HelpdeskAPIError):
+                client.fetch_requests()
+
+    assert seen == ["POST"] * attempts
+
+def _raise_http_error(session: Mock) -> None:
+    session.post.return_value = FakeResponse(error=HTTPError("404 not found"))
+
+def _return_invalid_json(session: Mock) -> None:
+    session.post.return_value = FakeResponse(content=b"not json")
+
+def _return_unexpected_shape(session: Mock) -> None:
+    payload = {"response_code": 200, "data": {"not_requests": []}}
+    session.post.return_value = FakeResponse(content=json.dumps(payload).encode("utf-8"))
+
+def _exhaust_adapter_retries(session: Mock) -> None:
+    session.post.side_effect = RetryError("too many 500 error responses")
+
+# HTTP, JSON, shape and exhausted-retry failures all surface as HelpdeskAPIError after one post()
+@pytest.mark.parametrize(
+    "setup_session",
+    [
+        pytest.param(_raise_http_error, id="http-error"),
+        pytest.param(_return_invalid_json, id="invalid-json"),
+        pytest.param(_return_unexpected_shape, id="unexpected-shape"),
+        pytest.param(_exhaust_adapter_retries, id="retries-exhausted"),
+    ],
+)
+def test_fetch_requests_errors_are_wrapped_in_helpdesk_api_error(
+    helpdesk_config: HelpdeskAPIConfig,
+    setup_session: Callable[[Mock], None],
+) -> None:
     mock_session = Mock()
-    mock_response = Mock()
-    mock_response.raise_for_status = Mock()
-    mock_response.json.side_effect = ValueError("invalid json")
-
-    mock_session.post.return_value = mock_response
-    client._session = mock_session                                                                                          # type: ignore[attr-defined]
+    setup_session(mock_session)
+    client = HelpdeskClient(helpdesk_config, max_retries=3, backoff_factor=0.0, session=mock_session)                       # type: ignore[arg-type]
 
     with pytest.raises(HelpdeskAPIError):
-        _ = client.fetch_requests()
-
-def test_fetch_requests_retries_then_succeeds(monkeypatch: pytest.MonkeyPatch) -> None:
-    # avoid real sleep during tests
-    monkeypatch.setattr("app.infrastructure.helpdesk_client.time.sleep", lambda _: None)
-
-    config = HelpdeskAPIConfig(
-        url="https://example.com/helpdesk",
-        api_key="dummy-key",
-        api_secret="dummy-secret",
-        timeout_seconds=5.0,
-    )
-    client = HelpdeskClient(config, max_retries=3, backoff_factor=0.0)
-
-    mock_session = Mock()
-
-    # first call -> HTTPError, second call -> ok
-    bad_response = Mock()
-    bad_response.raise_for_status.side_effect = HTTPError("503")
+        client.fetch_requests()
 
-    ok_payload: dict[str, Any] = {
-        "data": {"requests": [{"id": "req_1", "short_description": "hi"}]},
-    }
-    ok_response = Mock()
-    ok_response.raise_for_status = Mock()
-    ok_response.json = Mock(return_value=ok_payload)
+    assert mock_session.post.call_count == 1
 
-    mock_session.post.side_effect = [bad_response, ok_response]
-    client._session = mock_session  # type: ignore[attr-defined]
+def test_fetch_requests_supports_top_level_list(helpdesk_config: HelpdeskAPIConfig) -> None:
+    payload = [{"id": "req_1", "short_description": "a"}]
+    client = _make_client_with_mock_session(helpdesk_config, payload)
 
     result = client.fetch_requests()
-    assert len(result) == 1
     assert result[0].request.id == "req_1"
-    assert mock_session.post.call_count == 2
-
-def test_fetch_requests_retries_exhausted_raises(monkeypatch: pytest.MonkeyPatch) -> None:
-    # avoid real sleep during tests
-    monkeypatch.setattr("app.infrastructure.helpdesk_client.time.sleep", lambda _: None)
 
-    config = HelpdeskAPIConfig(
-        url="https://example.com/helpdesk",
-        api_key="dummy-key",
-        api_secret="dummy-secret",
-        timeout_seconds=5.0,
-    )
-    client = HelpdeskClient(config, max_retries=3, backoff_factor=0.0)
 
-    mock_session = Mock()
-    failing_response = Mock()
-    failing_response.raise_for_status.side_effect = HTTPError("500")
-    mock_session.post.return_value = failing_response
-    client._session = mock_session                                                                                          # type: ignore[attr-defined]
+def test_fetch_requests_supports_data_as_list(helpdesk_config: HelpdeskAPIConfig) -> None:
+    payload = {"data": [{"id": "req_1", "short_description": "a"}]}
+    client = _make_client_with_mock_session(helpdesk_config, payload)
 
-    with pytest.raises(HelpdeskAPIError):
-        client.fetch_requests()
+    result = client.fetch_requests()
+    assert result[0].request.id == "req_1"
 
-    assert mock_session.post.call_count == 3
+# well-formed lists are returned as-is; non-dict entries are dropped otherwise
+def test_extract_items_filters_only_when_needed(helpdesk_config: HelpdeskAPIConfig) -> None:
+    client = _make_client_with_mock_session(helpdesk_config, {})
 
-def test_fetch_requests_supports_top_level_list() -> None:
-    payload = [{"id": "req_1", "short_description": "a"}]
-    client = _make_client_with_mock_session(payload)
+    rows = [{"id": "req_1"}, {"id": "req_2"}]
+    assert client._extract_items(rows) is rows                                                                              # type: ignore[attr-defined]
 
-    result = client.fetch_requests()
-    assert result[0].request.id == "req_1"
+    mixed = [{"id": "req_1"}, "junk", None]
+    assert client._extract_items({"data": mixed}) == [{"id": "req_1"}]                                                      # type: ignore[attr-defined]
 
+# an injected session is given the same retry adapter as the default one
+def test_injected_session_gets_retry_adapter(helpdesk_config: HelpdeskAPIConfig) -> None:
+    session = requests.Session()
 
-def test_fetch_requests_supports_data_as_list() -> None:
-    payload = {"data": [{"id": "req_1", "short_description": "a"}]}
-    client = _make_client_with_mock_session(payload)
+    HelpdeskClient(helpdesk_config, max_retries=4, session=session)
 
-    result = client.fetch_requests()
-    assert result[0].request.id == "req_1"
\ No newline at end of file
+    assert session.get_adapter(helpdesk_config.url).max_retries.total == 3
@@ -2,12 +2,19 @@ from __future__ import annotations
 import json
 from dataclasses import dataclass
 from typing import Any
+from unittest.mock import Mock
 import pytest
-from app.infrastructure.llm_classifier import LLMClassifier
+from app.infrastructure.llm_classifier import LLMClassifier, _build_batch, _catalog_to_prompt_fragment
+from app.infrastructure.llm_classifier_prompt import LLM_BATCH_PROMPT_TEMPLATE
 from app.application.llm_classifier import LLMClassificationResult, LLMClassificationError
 
+# fixed model replies, serialized once; never mutate them in a test
+_EMPTY_ITEMS_JSON = json.dumps({"items": []})
+_MISSING_ITEMS_JSON = json.dumps({"foo": "bar"})
+_TOP_LEVEL_LIST_JSON = json.dumps([{"id": "req_1"}])
+_SINGLE_ITEM_JSON = json.dumps({"items": [{"id": "r1"}]})
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DummyLLMConfig:
     api_key: str = "dummy-key"
     model_name: str = "dummy-model"
@@ -16,8 +23,9 @@ class DummyLLMConfig:
     temperature: float = 0.0
     top_p: float = 1.0
     top_k: int = 1
+    max_retries: int = 1
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DummyHelpdeskRequest:
     id: str
     short_description: str = ""
@@ -27,26 +35,44 @@ class DummyHelpdeskRequest:
     sla_unit: str = ""
     sla_value: int = 0
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DummySLA:
     unit: str
     value: int
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DummyRequestType:
     name: str
     sla: DummySLA
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DummyCategory:
     name: str
     requests: list[DummyRequestType]
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DummyCatalog:
     categories: list[DummyCategory]
 
-@dataclass
+# tests that do not inject a client must not build a real genai.Client (~50 ms each)
+@pytest.fixture(autouse=True)
+def _no_genai_client(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("app.infrastructure.llm_classifier.genai.Client", lambda **_: Mock())
+
+def _noop_sleep(_: float) -> None:
+    return None
+
+# retry/poll back-offs never really wait; tests that inspect sleeps patch over this
+@pytest.fixture(autouse=True)
+def _no_sleep(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("app.infrastructure.llm_classifier.time.sleep", _noop_sleep)
+
+# read-only, so one instance serves every test in the module
+@pytest.fixture(scope="module")
+def empty_catalog() -> DummyCatalog:
+    return DummyCatalog(categories=[])
+
+@dataclass(frozen=True, slots=True)
 class DummyResponse:
     text: str
 
@@ -66,8 +92,6 @@ class DummyClient:
 
 # classify_batch parses JSON and returns mapping id -> result
 def test_classify_batch_happy_path(caplog: pytest.LogCaptureFixture) -> None:
-    caplog.set_level("WARNING")
-
     # fake LLM JSON output
     payload = {
         "items": [
@@ -91,8 +115,7 @@ def test_classify_batch_happy_path(caplog: pytest.LogCaptureFixture) -> None:
 
     # construct classifier with dummy config and client
     cfg = DummyLLMConfig()
-    classifier = LLMClassifier(cfg)                                                                                         # type: ignore[arg-type]
-    classifier._client = DummyClient(response)                                                                              # type: ignore[attr-defined]
+    classifier = LLMClassifier(cfg, client=DummyClient(response))                                                           # type: ignore[arg-type]
 
     # build minimal catalog (content is irrelevant, just needs to be structurally valid)
     catalog = DummyCatalog(
@@ -146,26 +169,24 @@ def test_classify_batch_happy_path(caplog: pytest.LogCaptureFixture) -> None:
 
 
 # empty input returns empty mapping and must not call generate_content
-def test_classify_batch_empty_requests() -> None:
-    response = DummyResponse(text=json.dumps({"items": []}))
+def test_classify_batch_empty_requests(empty_catalog: DummyCatalog) -> None:
+    response = DummyResponse(text=_EMPTY_ITEMS_JSON)
     cfg = DummyLLMConfig()
-    classifier = LLMClassifier(cfg)                                                                                         # type: ignore[arg-type]
-    classifier._client = DummyClient(response)                                                                              # type: ignore[attr-defined]
+    classifier = LLMClassifier(cfg, client=DummyClient(response))                                                           # type: ignore[arg-type]
 
-    catalog = DummyCatalog(categories=[])
+    catalog = empty_catalog
     results = classifier.classify_batch([], catalog)                                                                # type: ignore[arg-type]
 
     assert results == {}
 
 
 # invalid JSON in response raises LLMClassificationError
-def test_classify_batch_invalid_json_raises() -> None:
+def test_classify_batch_invalid_json_raises(empty_catalog: DummyCatalog) -> None:
     response = DummyResponse(text="this is not json")
     cfg = DummyLLMConfig()
-    classifier = LLMClassifier(cfg)                                                                                         # type: ignore[arg-type]
-    classifier._client = DummyClient(response)                                                                              # type: ignore[attr-defined]
+    classifier = LLMClassifier(cfg, client=DummyClient(response))                                                           # type: ignore[arg-type]
 
-    catalog = DummyCatalog(categories=[])
+    catalog = empty_catalog
     requests = [DummyHelpdeskRequest(id="req_1")]
 
     with pytest.raises(LLMClassificationError):
@@ -173,32 +194,41 @@ def test_classify_batch_invalid_json_raises() -> None:
 
 
 # missing 'items' key raises LLMClassificationError
-def test_classify_batch_missing_items_raises() -> None:
-    response = DummyResponse(text=json.dumps({"foo": "bar"}))
+def test_classify_batch_missing_items_raises(empty_catalog: DummyCatalog) -> None:
+    response = DummyResponse(text=_MISSING_ITEMS_JSON)
     cfg = DummyLLMConfig()
-    classifier = LLMClassifier(cfg)                                                                                         # type: ignore[arg-type]
-    classifier._client = DummyClient(response)                                                                              # type: ignore[attr-defined]
+    classifier = LLMClassifier(cfg, client=DummyClient(response))                                                           # type: ignore[arg-type]
 
-    catalog = DummyCatalog(categories=[])
+    catalog = empty_catalog
     requests = [DummyHelpdeskRequest(id="req_1")]
 
     with pytest.raises(LLMClassificationError):
         classifier.classify_batch(requests, catalog)                                                                        # type: ignore[arg-type]
 
-def test_classify_batch_empty_items_list_raises() -> None:
-    payload = {"items": []}
-    response = DummyResponse(text=json.dumps(payload))
+# a top-level JSON array (no wrapper object) raises LLMClassificationError
+def test_classify_batch_top_level_list_raises(empty_catalog: DummyCatalog) -> None:
+    response = DummyResponse(text=_TOP_LEVEL_LIST_JSON)
     cfg = DummyLLMConfig()
-    classifier = LLMClassifier(cfg)                                                                                         # type: ignore[arg-type]
-    classifier._client = DummyClient(response)                                                                              # type: ignore[attr-defined]
+    classifier = LLMClassifier(cfg, client=DummyClient(response))                                                           # type: ignore[arg-type]
 
-    catalog = DummyCatalog(categories=[])
+    catalog = empty_catalog
     requests = [DummyHelpdeskRequest(id="req_1")]
 
     with pytest.raises(LLMClassificationError):
         classifier.classify_batch(requests, catalog)                                                                        # type: ignore[arg-type]
 
-def test_classify_batch_all_items_missing_id_raises() -> None:
+def test_classify_batch_empty_items_list_raises(empty_catalog: DummyCatalog) -> None:
+    response = DummyResponse(text=_EMPTY_ITEMS_JSON)
+    cfg = DummyLLMConfig()
+    classifier = LLMClassifier(cfg, client=DummyClient(response))                                                           # type: ignore[arg-type]
+
+    catalog = empty_catalog
+    requests = [DummyHelpdeskRequest(id="req_1")]
+
+    with pytest.raises(LLMClassificationError):
+        classifier.classify_batch(requests, catalog)                                                                        # type: ignore[arg-type]
+
+def test_classify_batch_all_items_missing_id_raises(empty_catalog: DummyCatalog) -> None:
     payload = {
         "items": [
             {
@@ -220,11 +250,234 @@ def test_classify_batch_all_items_missing_id_raises() -> None:
     }
     response = DummyResponse(text=json.dumps(payload))
     cfg = DummyLLMConfig()
-    classifier = LLMClassifier(cfg)                                                                                         # type: ignore[arg-type]
-    classifier._client = DummyClient(response)                                                                              # type: ignore[attr-defined]
+    classifier = LLMClassifier(cfg, client=DummyClient(response))                                                           # type: ignore[arg-type]
 
-    catalog = DummyCatalog(categories=[])
+    catalog = empty_catalog
     requests = [DummyHelpdeskRequest(id="req_1")]
 
     with pytest.raises(LLMClassificationError):
-        classifier.classify_batch(requests, catalog)                                                                        # type: ignore[arg-type]
\ No newline at end of file
+        classifier.classify_batch(requests, catalog)                                                                        # type: ignore[arg-type]
+
+# the catalog prompt fragment is rendered once per catalog, not once per batch
+def test_classify_batch_renders_catalog_once(monkeypatch: pytest.MonkeyPatch, empty_catalog: DummyCatalog) -> None:
+    response = DummyResponse(text=_SINGLE_ITEM_JSON)
+    classifier = LLMClassifier(DummyLLMConfig(), client=DummyClient(response))                                              # type: ignore[arg-type]
+
+    rendered: list[Any] = []
+
+    def fake_fragment(catalog: Any) -> str:
+        rendered.append(catalog)
+        return "catalog"
+
+    monkeypatch.setattr("app.infrastructure.llm_classifier._catalog_to_prompt_fragment", fake_fragment)
+
+    catalog = empty_catalog
+    requests = [DummyHelpdeskRequest(id="r1")]
+    classifier.classify_batch(requests, catalog)                                                                            # type: ignore[arg-type]
+    classifier.classify_batch(requests, catalog)                                                                            # type: ignore[arg-type]
+
+    assert rendered == [catalog]
+
+    # a different catalog object is rendered again
+    other_catalog = DummyCatalog(categories=[])
+    classifier.classify_batch(requests, other_catalog)                                                                      # type: ignore[arg-type]
+
+    assert len(rendered) == 2
+
+# the cached head/tail produce the same prompt as formatting the full template
+def test_classify_batch_prompt_matches_template() -> None:
+    response = DummyResponse(text=_SINGLE_ITEM_JSON)
+    classifier = LLMClassifier(DummyLLMConfig(), client=DummyClient(response))                                              # type: ignore[arg-type]
+
+    catalog = DummyCatalog(
+        categories=[DummyCategory(name="Access {x}", requests=[DummyRequestType("Reset", DummySLA("hours", 4))])],
+    )
+    requests = [DummyHelpdeskRequest(id="r1", short_description="Forgot {password}")]
+
+    classifier.classify_batch(requests, catalog)                                                                            # type: ignore[arg-type]
+
+    expected = LLM_BATCH_PROMPT_TEMPLATE.format(
+        catalog=_catalog_to_prompt_fragment(catalog),                                                                       # type: ignore[arg-type]
+        requests_block=_build_batch(requests),                                                                              # type: ignore[arg-type]
+    )
+    assert classifier._client.models.last_kwargs["contents"] == expected                                                    # type: ignore[attr-defined]
+
+# call starts are spaced by delay_between_batches; elapsed time counts toward it
+def test_wait_for_call_slot_spaces_call_starts(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [100.0]
+    sleeps: list[float] = []
+
+    def fake_sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    monkeypatch.setattr("app.infrastructure.llm_classifier.time.monotonic", lambda: now[0])
+    monkeypatch.setattr("app.infrastructure.llm_classifier.time.sleep", fake_sleep)
+
+    classifier = LLMClassifier(DummyLLMConfig(delay_between_batches=2.0))                                                   # type: ignore[arg-type]
+
+    classifier._wait_for_call_slot()                                                                                        # type: ignore[attr-defined]
+    now[0] += 0.5
+    classifier._wait_for_call_slot()                                                                                        # type: ignore[attr-defined]
+    now[0] += 5.0
+    classifier._wait_for_call_slot()                                                                                        # type: ignore[attr-defined]
+
+    assert sleeps == [1.5]
+
+# a failed call is retried with the same prompt, which is built only once
+def test_classify_batch_retries_with_same_prompt(monkeypatch: pytest.MonkeyPatch, empty_catalog: DummyCatalog) -> None:
+    build_calls: list[int] = []
+    real_build = _build_batch
+
+    def counting_build(requests: list[Any]) -> str:
+        build_calls.append(len(requests))
+        return real_build(requests)
+
+    monkeypatch.setattr("app.infrastructure.llm_classifier._build_batch", counting_build)
+
+    prompts: list[str] = []
+    response = DummyResponse(text=json.dumps({"items": [{"id": "req_1", "request_type": "x"}]}))
+
+    class FlakyModels:
+        def generate_content(self, **kwargs: Any) -> DummyResponse:
+            prompts.append(kwargs["contents"])
+            if len(prompts) == 1:
+                raise RuntimeError("503 unavailable")
+            return response
+
+    classifier = LLMClassifier(DummyLLMConfig(max_retries=2), client=Mock(models=FlakyModels()))                            # type: ignore[arg-type]
+
+    results = classifier.classify_batch([DummyHelpdeskRequest(id="req_1")], empty_catalog)                                  # type: ignore[list-item, arg-type]
+
+    assert set(results) == {"req_1"}
+    assert build_calls == [1]
+    assert len(prompts) == 2
+    assert prompts[0] is prompts[1]
+
+# malformed items are reported in one summary warning instead of one per item
+def test_classify_batch_summarizes_skipped_items(caplog: pytest.LogCaptureFixture, empty_catalog: DummyCatalog) -> None:
+    items: list[Any] = [{"id": "req_1"}, "junk", {"id": " "}] + [42] * 10
+    response = DummyResponse(text=json.dumps({"items": items}))
+    classifier = LLMClassifier(DummyLLMConfig(), client=DummyClient(response))                                              # type: ignore[arg-type]
+
+    results = classifier.classify_batch([DummyHelpdeskRequest(id="req_1")], empty_catalog)                                  # type: ignore[list-item, arg-type]
+
+    assert set(results) == {"req_1"}
+    skip_records = [r for r in caplog.records if "malformed LLM item" in r.getMessage()]
+    assert len(skip_records) == 1
+    assert "Skipped 12 malformed" in skip_records[0].getMessage()
+
+# classify_bulk submits one inlined prompt per batch, polls the job and maps responses back in order
+def test_classify_bulk_polls_job_and_maps_responses(empty_catalog: DummyCatalog) -> None:
+    from google.genai import types
+
+    ok = DummyResponse(text=json.dumps({"items": [{"id": "req_1", "request_category": "Access"}]}))
+    done_job = types.BatchJob(
+        name="batches/1",
+        state=types.JobState.JOB_STATE_SUCCEEDED,
+        dest=types.BatchJobDestination(
+            inlined_responses=[
+                types.InlinedResponse.model_construct(response=ok, error=None),
+                types.InlinedResponse.model_construct(response=None, error="quota"),
+            ],
+        ),
+    )
+
+    class FakeBatches:
+        def __init__(self) -> None:
+            self.src: list[Any] = []
+            self.gets = 0
+
+        def create(self, *, model: str, src: list[Any]) -> types.BatchJob:
+            self.src = src
+            return types.BatchJob(name="batches/1", state=types.JobState.JOB_STATE_PENDING)
+
+        def get(self, *, name: str) -> types.BatchJob:
+            self.gets += 1
+            return done_job
+
+    batches = FakeBatches()
+    classifier = LLMClassifier(DummyLLMConfig(), client=Mock(batches=batches))                                              # type: ignore[arg-type]
+    catalog = empty_catalog
+    requests = [[DummyHelpdeskRequest(id="req_1")], [DummyHelpdeskRequest(id="req_2")]]
+
+    results = classifier.classify_bulk(requests, catalog)                                                                   # type: ignore[arg-type]
+
+    assert batches.gets == 1
+    assert [entry.contents for entry in batches.src] == [
+        LLM_BATCH_PROMPT_TEMPLATE.format(
+            catalog=_catalog_to_prompt_fragment(catalog),                                                                   # type: ignore[arg-type]
+            requests_block=_build_batch(batch),                                                                             # type: ignore[arg-type]
+        )
+        for batch in requests
+    ]
+    assert results[0] is not None and results[0]["req_1"].request_category == "Access"
+    assert results[1] is None
+
+# a failed poll is retried under max_retries; when polls run out the error names the job
+def test_classify_bulk_retries_failed_polls(caplog: pytest.LogCaptureFixture, empty_catalog: DummyCatalog) -> None:
+    from google.genai import types
+
+    ok = DummyResponse(text=json.dumps({"items": [{"id": "req_1"}]}))
+    done_job = types.BatchJob(
+        name="batches/7",
+        state=types.JobState.JOB_STATE_SUCCEEDED,
+        dest=types.BatchJobDestination(
+            inlined_responses=[types.InlinedResponse.model_construct(response=ok, error=None)],
+        ),
+    )
+    batches = Mock()
+    batches.create.return_value = types.BatchJob(name="batches/7", state=types.JobState.JOB_STATE_RUNNING)
+    batches.get.side_effect = [RuntimeError("503 unavailable"), done_job]
+    requests = [[DummyHelpdeskRequest(id="req_1")]]
+
+    classifier = LLMClassifier(DummyLLMConfig(max_retries=2), client=Mock(batches=batches))                                 # type: ignore[arg-type]
+    results = classifier.classify_bulk(requests, empty_catalog)                                                             # type: ignore[arg-type]
+
+    assert results[0] is not None and set(results[0]) == {"req_1"}
+    assert batches.get.call_count == 2
+
+    batches.get.side_effect = RuntimeError("503 unavailable")
+    classifier = LLMClassifier(DummyLLMConfig(max_retries=1), client=Mock(batches=batches))                                 # type: ignore[arg-type]
+
+    with pytest.raises(LLMClassificationError):
+        classifier.classify_bulk(requests, empty_catalog)                                                                   # type: ignore[arg-type]
+
+    assert "batches/7" in caplog.text
+
+# polling stops on states that are neither pending nor done, and on jobs that outlive the wait limit
+@pytest.mark.parametrize(
+    ("state", "gets"),
+    [
+        pytest.param("JOB_STATE_UNSPECIFIED", 0, id="unspecified"),
+        pytest.param("JOB_STATE_CANCELLING", 0, id="cancelling"),
+        pytest.param("JOB_STATE_RUNNING", 2, id="deadline"),
+    ],
+)
+def test_classify_bulk_stops_polling(
+    monkeypatch: pytest.MonkeyPatch,
+    empty_catalog: DummyCatalog,
+    state: str,
+    gets: int,
+) -> None:
+    from google.genai import types
+
+    now = [0.0]
+
+    def fake_sleep(seconds: float) -> None:
+        now[0] += seconds
+
+    monkeypatch.setattr("app.infrastructure.llm_classifier.time.monotonic", lambda: now[0])
+    monkeypatch.setattr("app.infrastructure.llm_classifier.time.sleep", fake_sleep)
+    monkeypatch.setattr("app.infrastructure.llm_classifier._BULK_MAX_WAIT_SECONDS", 60.0)
+
+    job = types.BatchJob(name="batches/9", state=types.JobState(state))
+    batches = Mock()
+    batches.create.return_value = job
+    batches.get.return_value = job
+    classifier = LLMClassifier(DummyLLMConfig(), client=Mock(batches=batches))                                              # type: ignore[arg-type]
+
+    with pytest.raises(LLMClassificationError):
+        classifier.classify_bulk([[DummyHelpdeskRequest(id="req_1")]], empty_catalog)                                       # type: ignore[list-item, arg-type]
+
+    assert batches.get.call_count == gets
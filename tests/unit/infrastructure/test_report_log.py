@@ -0,0 +1,45 @@
+from __future__ import annotations
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from app.infrastructure.report_log import SQLiteReportLog
+
+
+# mark_sent_many stores every path with the same timestamp
+def test_mark_sent_many_records_all_paths(tmp_path: Path) -> None:
+    report_log = SQLiteReportLog(tmp_path / "db" / "reports.sqlite")
+    sent_at = datetime(2025, 12, 10, 10, 0, 0)
+
+    report_log.mark_sent_many([tmp_path / "a.xlsx", tmp_path / "b.xlsx"], created_at=sent_at)
+
+    for name in ("a.xlsx", "b.xlsx"):
+        record = report_log.get_record(tmp_path / name)
+        assert record is not None
+        assert record.created_at == sent_at
+    assert report_log.get_record(tmp_path / "c.xlsx") is None
+
+# the database is switched to WAL journaling on first use
+def test_report_log_uses_wal_journal(tmp_path: Path) -> None:
+    db_path = tmp_path / "reports.sqlite"
+    SQLiteReportLog(db_path)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    finally:
+        conn.close()
+
+    assert journal_mode == "wal"
+
+# get_records returns only the paths that have a record
+def test_get_records_returns_logged_paths_only(tmp_path: Path) -> None:
+    report_log = SQLiteReportLog(tmp_path / "reports.sqlite")
+    sent_at = datetime(2025, 12, 10, 10, 0, 0)
+    sent = tmp_path / "sent.xlsx"
+    unsent = tmp_path / "unsent.xlsx"
+    report_log.mark_sent(sent, created_at=sent_at)
+
+    records = report_log.get_records([sent, unsent])
+
+    assert list(records) == [sent]
+    assert records[sent].created_at == sent_at
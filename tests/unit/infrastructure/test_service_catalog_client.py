@@ -1,3 +1,8 @@
+import json
+import pickle
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Any
 from unittest.mock import Mock
 import pytest
@@ -11,25 +16,50 @@ from app.infrastructure.service_catalog_client import (
 from app.shared.errors import ServiceCatalogLoadError
 
 
-def _make_client_with_mock_session(raw_text: str) -> ServiceCatalogClient:
-    config = ServiceCatalogConfig(
-        url="https://example.com/service-catalog",
-        timeout_seconds=5.0,
-    )
+def _noop_sleep(_: float) -> None:
+    return None
+
+# _download_text backs off between retries; never really wait in tests
+@pytest.fixture(autouse=True)
+def _no_sleep(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("app.infrastructure.service_catalog_client.time.sleep", _noop_sleep)
 
-    client = ServiceCatalogClient(config)
+# plain stand-in for requests.Response: only what ServiceCatalogClient reads
+@dataclass
+class FakeResponse:
+    text: str = ""
+    status_code: int = 200
+    headers: dict[str, str] = field(default_factory=dict)
+    error: Exception | None = None
 
+    def raise_for_status(self) -> None:
+        if self.error is not None:
+            raise self.error
+
+def _make_client_with_mock_session(config: ServiceCatalogConfig, raw_text: str) -> ServiceCatalogClient:
     mock_session = Mock()
-    mock_response = Mock()
-    mock_response.raise_for_status = Mock()
-    mock_response.text = raw_text
+    mock_session.get = Mock(return_value=FakeResponse(text=raw_text))
+
+    return ServiceCatalogClient(config, session=mock_session)                                                               # type: ignore[arg-type]
 
-    mock_session.get = Mock(return_value=mock_response)
-    client._session = mock_session                              # type: ignore[attr-defined]
+# already-parsed YAML for tests that exercise mapping/caching rather than PyYAML
+_ACCESS_CATALOG_DICT: dict[str, Any] = {
+    "service_catalog": {
+        "catalog": {
+            "categories": [
+                {
+                    "name": "Access Management",
+                    "requests": [{"name": "Reset Okta password", "sla": {"unit": "hours", "value": 4}}],
+                },
+            ],
+        },
+    },
+}
 
-    return client
+def _stub_parse_yaml(monkeypatch: pytest.MonkeyPatch, data: dict[str, Any]) -> None:
+    monkeypatch.setattr(ServiceCatalogClient, "_parse_yaml", lambda self, text: data)
 
-def test_fetch_catalog_happy_path() -> None:
+def test_fetch_catalog_happy_path(service_catalog_config: ServiceCatalogConfig) -> None:
     yaml_text = """
 service_catalog:
   catalog:
@@ -42,7 +72,7 @@ service_catalog:
               value: "4"
 """
 
-    client = _make_client_with_mock_session(yaml_text)
+    client = _make_client_with_mock_session(service_catalog_config, yaml_text)
 
     catalog: ServiceCatalog = client.fetch_catalog()
 
@@ -57,14 +87,12 @@ service_catalog:
     # value must be converted to int
     assert req.sla.value == 4
 
-def test_fetch_catalog_unexpected_shape_raises() -> None:
-    yaml_text = """
-service_catalog:
-  catalog:
-    not_categories: []
-"""
-
-    client = _make_client_with_mock_session(yaml_text)
+def test_fetch_catalog_unexpected_shape_raises(
+    monkeypatch: pytest.MonkeyPatch,
+    service_catalog_config: ServiceCatalogConfig,
+) -> None:
+    _stub_parse_yaml(monkeypatch, {"service_catalog": {"catalog": {"not_categories": []}}})
+    client = _make_client_with_mock_session(service_catalog_config, "")
 
     with pytest.raises(ServiceCatalogLoadError) as excinfo:
         _ = client.fetch_catalog()
@@ -72,17 +100,19 @@ service_catalog:
     assert isinstance(excinfo.value.__cause__, ServiceCatalogError)
 
 
-def test_fetch_catalog_mapping_error_raises() -> None:
-    yaml_text = """
-service_catalog:
-  catalog:
-    categories:
-      - name: "Access Management"
-        requests:
-          - name: "Reset Okta password"
-"""
-
-    client = _make_client_with_mock_session(yaml_text)
+def test_fetch_catalog_mapping_error_raises(
+    monkeypatch: pytest.MonkeyPatch,
+    service_catalog_config: ServiceCatalogConfig,
+) -> None:
+    payload = {
+        "service_catalog": {
+            "catalog": {
+                "categories": [{"name": "Access Management", "requests": [{"name": "Reset Okta password"}]}],
+            },
+        },
+    }
+    _stub_parse_yaml(monkeypatch, payload)
+    client = _make_client_with_mock_session(service_catalog_config, "")
 
     with pytest.raises(ServiceCatalogLoadError) as excinfo:
         _ = client.fetch_catalog()
@@ -91,36 +121,141 @@ service_catalog:
 
 def test_parse_yaml_error_is_wrapped_in_service_catalog_error(
     monkeypatch: pytest.MonkeyPatch,
+    service_catalog_config: ServiceCatalogConfig,
 ) -> None:
     import yaml  # type: ignore[import]
 
-    config = ServiceCatalogConfig(
-        url="https://example.com/service-catalog",
-        timeout_seconds=5.0,
-    )
-    client = ServiceCatalogClient(config)
+    client = ServiceCatalogClient(service_catalog_config)
 
-    def fake_safe_load(_: str) -> Any:
+    def fake_load(_: str, Loader: Any) -> Any:
         raise yaml.YAMLError("bad yaml")                                                                                    # type: ignore[attr-defined]
 
-    monkeypatch.setattr("yaml.safe_load", fake_safe_load)
+    monkeypatch.setattr("yaml.load", fake_load)
 
     with pytest.raises(ServiceCatalogError):
         _ = client._parse_yaml(":::")                                                                                       # type: ignore[attr-defined]
 
-def test_download_text_http_error_raises_service_catalog_error() -> None:
+# a None entry in sys.modules makes `import yaml` raise ImportError without an import hook
+def test_parse_yaml_import_error_is_wrapped_in_service_catalog_error(
+    monkeypatch: pytest.MonkeyPatch,
+    service_catalog_config: ServiceCatalogConfig,
+) -> None:
+    monkeypatch.setitem(sys.modules, "yaml", None)
+    client = ServiceCatalogClient(service_catalog_config)
+
+    with pytest.raises(ServiceCatalogError) as excinfo:
+        _ = client._parse_yaml("service_catalog: {}")                                                                       # type: ignore[attr-defined]
+
+    assert isinstance(excinfo.value.__cause__, ImportError)
+
+# _download_text makes at most max_retries GETs and only raises once they are all spent
+@pytest.mark.parametrize(
+    ("failures", "max_retries", "succeeds", "calls"),
+    [
+        pytest.param(0, 3, True, 1, id="first-try"),
+        pytest.param(1, 3, True, 2, id="recovers"),
+        pytest.param(2, 3, True, 3, id="recovers-on-last-attempt"),
+        pytest.param(3, 3, False, 3, id="exhausted"),
+        pytest.param(1, 1, False, 1, id="no-retries"),
+    ],
+)
+def test_download_text_retry_matrix(
+    service_catalog_config: ServiceCatalogConfig,
+    failures: int,
+    max_retries: int,
+    succeeds: bool,
+    calls: int,
+) -> None:
+    responses = [FakeResponse(error=HTTPError("500 server error")) for _ in range(failures)]
+    responses.append(FakeResponse(text="service_catalog: {}"))
+    mock_session = Mock()
+    mock_session.get.side_effect = responses
+    client = ServiceCatalogClient(service_catalog_config, max_retries=max_retries, session=mock_session)                    # type: ignore[arg-type]
+
+    if succeeds:
+        text, _ = client._download_text()                                                                                   # type: ignore[attr-defined]
+        assert text == "service_catalog: {}"
+    else:
+        with pytest.raises(ServiceCatalogError):
+            _ = client._download_text()                                                                                     # type: ignore[attr-defined]
+
+    assert mock_session.get.call_count == calls
+
+# the parsed catalog is reused until the TTL expires
+def test_fetch_catalog_reuses_cached_catalog_within_ttl(
+    monkeypatch: pytest.MonkeyPatch,
+    service_catalog_config: ServiceCatalogConfig,
+) -> None:
+    _stub_parse_yaml(monkeypatch, {"service_catalog": {"catalog": {"categories": []}}})
+    client = _make_client_with_mock_session(service_catalog_config, "")
+    now = [1000.0]
+    monkeypatch.setattr("app.infrastructure.service_catalog_client.time.monotonic", lambda: now[0])
+
+    first = client.fetch_catalog()
+    now[0] += 60.0
+    second = client.fetch_catalog()
+
+    assert second is first
+    assert client._session.get.call_count == 1                                                                              # type: ignore[attr-defined]
+
+    now[0] += 3600.0
+    third = client.fetch_catalog()
+
+    assert third is not first
+    assert client._session.get.call_count == 2                                                                              # type: ignore[attr-defined]
+
+# a 304 on a fresh client reuses the catalog a previous run saved to cache_path as JSON
+def test_fetch_catalog_revalidates_disk_cache_with_etag(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    _stub_parse_yaml(monkeypatch, _ACCESS_CATALOG_DICT)
     config = ServiceCatalogConfig(
         url="https://example.com/service-catalog",
-        timeout_seconds=5.0,
+        cache_path=str(tmp_path / "catalog.json"),
     )
 
-    client = ServiceCatalogClient(config)
+    first_session = Mock()
+    first_session.get.return_value = FakeResponse(text="", headers={"ETag": '"v1"'})
+    first_client = ServiceCatalogClient(config, session=first_session)                                                     # type: ignore[arg-type]
+    first = first_client.fetch_catalog()
 
-    mock_session = Mock()
-    mock_response = Mock()
-    mock_response.raise_for_status.side_effect = HTTPError("500 server error")
-    mock_session.get.return_value = mock_response
-    client._session = mock_session                                                                                          # type: ignore[attr-defined]
+    second_session = Mock()
+    second_session.get.return_value = FakeResponse(status_code=304)
+    second_client = ServiceCatalogClient(config, session=second_session)                                                   # type: ignore[arg-type]
+    second = second_client.fetch_catalog()
+
+    assert second == first
+    assert second_session.get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+
+# caches from another layout (old pickles, other versions, YAML that no longer maps) trigger a full download
+@pytest.mark.parametrize(
+    "cached_bytes",
+    [
+        pytest.param(pickle.dumps(({"If-None-Match": '"v0"'}, "catalog")), id="legacy-pickle"),
+        pytest.param(
+            json.dumps({"version": 0, "validators": {"If-None-Match": '"v0"'}, "yaml": ""}).encode(),
+            id="other-version",
+        ),
+        pytest.param(
+            json.dumps({"version": 1, "validators": {"If-None-Match": '"v0"'}, "yaml": "service_catalog: {}"}).encode(),
+            id="unmappable-yaml",
+        ),
+    ],
+)
+def test_fetch_catalog_ignores_stale_disk_cache(tmp_path: Path, cached_bytes: bytes) -> None:
+    cache_path = tmp_path / "catalog.json"
+    cache_path.write_bytes(cached_bytes)
+    config = ServiceCatalogConfig(url="https://example.com/service-catalog", cache_path=str(cache_path))
+    yaml_text = """
+service_catalog:
+  catalog:
+    categories: []
+"""
+    session = Mock()
+    session.get.return_value = FakeResponse(text=yaml_text, headers={"ETag": '"v1"'})
+    client = ServiceCatalogClient(config, session=session)                                                                  # type: ignore[arg-type]
+
+    catalog = client.fetch_catalog()
+
+    assert catalog.categories == []
+    assert session.get.call_args.kwargs["headers"] is None
+    assert json.loads(cache_path.read_bytes())["validators"] == {"If-None-Match": '"v1"'}
 
-    with pytest.raises(ServiceCatalogError):
-        _ = client._download_text()                                                                                         # type: ignore[attr-defined]